@@ -8,17 +8,43 @@ Workers operate inside directory jails with bounded recursion depth.
 """
 
 import argparse
+import copy
 import json
 import os
-import sqlite3
-import subprocess
+import shutil
+import sys
 import time
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if HAS_ORJSON:
+    _dumpb = orjson.dumps
+    _loads = orjson.loads
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+else:
+    _loads = json.loads
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(",", ":"))
+
+    def _dumpb(obj) -> bytes:
+        return _dumps(obj).encode("utf-8")
+
+# Audit decisions that are also mirrored into the SQLite audit_log table
+SQL_AUDIT_DECISIONS = frozenset({"APPROVED", "REJECTED"})
+
 # Tier ordering for comparison
 TIER_ORDER = {
     "safe": 0,
@@ -63,6 +89,8 @@ TOOL_POLICIES: Dict[str, ToolPolicy] = {
     "git_push": ToolPolicy(tier="dangerous", requires_approval=True, description="Push changes upstream"),
     "spawn_unbounded": ToolPolicy(tier="dangerous", requires_approval=True, description="Unbounded recursion spawn"),
 }
+# Interned keys let guard_action hit the identity fast path in dict lookups
+TOOL_POLICIES = {sys.intern(name): policy for name, policy in TOOL_POLICIES.items()}
 
 
 @dataclass
@@ -75,20 +103,23 @@ class ExecutionBudget:
     start_time: float = field(default_factory=time.time)
     steps: int = 0
 
-    def consume_step(self, recursion_depth: int) -> Tuple[bool, str]:
-        """Increment step counter and check ceilings."""
+    def consume_step(self, recursion_depth: int, now: Optional[float] = None) -> Tuple[bool, str]:
+        """Increment step counter and check ceilings.
+
+        Pass ``now`` to reuse a clock reading the caller already took.
+        """
         self.steps += 1
         if self.steps > self.max_steps:
             return False, "Step budget exceeded"
-        elapsed = time.time() - self.start_time
+        elapsed = (time.time() if now is None else now) - self.start_time
         if elapsed > self.max_seconds:
             return False, "Time budget exceeded"
         if recursion_depth > self.max_recursion:
             return False, "Recursion ceiling exceeded"
         return True, "Within budget"
 
-    def status(self) -> Dict[str, int]:
-        elapsed = int(time.time() - self.start_time)
+    def status(self, now: Optional[float] = None) -> Dict[str, int]:
+        elapsed = int((time.time() if now is None else now) - self.start_time)
         remaining_time = max(self.max_seconds - elapsed, 0)
         remaining_steps = max(self.max_steps - self.steps, 0)
         return {
@@ -138,97 +169,165 @@ class WorkspaceSandbox:
             raise PermissionError(f"Domain not allowed: {host}")
 
 
-class ApprovalQueue:
-    """Queues escalations and logs audit decisions using SQLite."""
+_SQL_CREATE_PENDING = """
+    CREATE TABLE IF NOT EXISTS pending_changes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        action_type TEXT,
+        action_data TEXT,
+        proposed_by TEXT,
+        proposed_at TEXT,
+        status TEXT,
+        reviewed_by TEXT,
+        reviewed_at TEXT,
+        review_notes TEXT
+    )
+"""
+
+_SQL_CREATE_AUDIT = """
+    CREATE TABLE IF NOT EXISTS audit_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp TEXT,
+        action_type TEXT,
+        action_data TEXT,
+        decision TEXT,
+        reason TEXT,
+        actor TEXT
+    )
+"""
+
+_SQL_INDEX_PENDING = """
+    CREATE INDEX IF NOT EXISTS idx_pending_status_time
+    ON pending_changes(status, proposed_at) WHERE status = 'pending'
+"""
+
+_SQL_INDEX_AUDIT = "CREATE INDEX IF NOT EXISTS idx_audit_time ON audit_log(timestamp)"
+
+_SQL_INSERT_PENDING = """
+    INSERT INTO pending_changes (action_type, action_data, proposed_by, proposed_at, status)
+    VALUES (?, ?, ?, ?, 'pending')
+"""
+
+_SQL_INSERT_AUDIT = """
+    INSERT INTO audit_log (timestamp, action_type, action_data, decision, reason, actor)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_LIST_PENDING = """
+    SELECT id, action_type, action_data, proposed_by, proposed_at, status
+    FROM pending_changes
+    WHERE status = 'pending'
+    ORDER BY proposed_at ASC
+"""
+
+_SQL_REVIEW_PENDING = """
+    UPDATE pending_changes
+    SET status = ?, reviewed_by = ?, reviewed_at = ?, review_notes = ?
+    WHERE id = ? AND status = 'pending'
+"""
+
+_SQL_GET_PENDING = "SELECT action_type, action_data, status FROM pending_changes WHERE id = ?"
+
 
-    def __init__(self, db_path: Path, actor: str):
+class ApprovalQueue:
+    """Queues escalations in SQLite and appends audit decisions to a JSONL log.
+
+    Opens one connection on the first DB-backed call (ALLOW/DENY checks never
+    touch SQLite) and holds it so the statement cache keeps the
+    module-level SQL above prepared across calls. Audit rows go to an
+    append-only JSONL file (default: the db path with its suffix replaced,
+    e.g. ``memory.db`` -> ``memory.audit.jsonl``). Each row is a single
+    ``os.write`` on an ``O_APPEND`` descriptor, so it reaches the file before
+    log_audit returns and rows from concurrent processes never interleave;
+    final APPROVED/REJECTED decisions are also written to ``audit_log`` so
+    ``governor.py audit`` keeps seeing reviews.
+    """
+
+    def __init__(self, db_path: Path, actor: str, audit_path: Optional[Path] = None):
         self.db_path = Path(db_path)
         self.actor = actor
-        self._ensure_tables()
-
-    def _ensure_tables(self):
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS pending_changes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                action_type TEXT,
-                action_data TEXT,
-                proposed_by TEXT,
-                proposed_at TEXT,
-                status TEXT,
-                reviewed_by TEXT,
-                reviewed_at TEXT,
-                review_notes TEXT
-            )
-        """)
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS audit_log (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT,
-                action_type TEXT,
-                action_data TEXT,
-                decision TEXT,
-                reason TEXT,
-                actor TEXT
-            )
-        """)
-        conn.commit()
-        conn.close()
+        self.audit_path = Path(audit_path) if audit_path else self.db_path.with_suffix(".audit.jsonl")
+        self._conn = None
+        self._audit_fd = os.open(self.audit_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    @property
+    def _db(self):
+        """The SQLite connection, opened (and tables ensured) on first use."""
+        if self._conn is None:
+            import sqlite3
+            conn = sqlite3.connect(self.db_path, cached_statements=256)
+            conn.execute(_SQL_CREATE_PENDING)
+            conn.execute(_SQL_CREATE_AUDIT)
+            conn.execute(_SQL_INDEX_PENDING)
+            conn.execute(_SQL_INDEX_AUDIT)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        os.close(self._audit_fd)
+        if self._conn is not None:
+            self._conn.close()
 
     def _utc_now(self) -> str:
         return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
     def queue(self, action_type: str, action_data: Dict, reason: str) -> int:
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO pending_changes (action_type, action_data, proposed_by, proposed_at, status)
-            VALUES (?, ?, ?, ?, 'pending')
-            """,
-            (action_type, json.dumps(action_data), self.actor, self._utc_now())
+        cur = self._db.execute(
+            _SQL_INSERT_PENDING,
+            (action_type, _dumps(action_data), self.actor, self._utc_now())
         )
         pending_id = cur.lastrowid
-        conn.commit()
-        conn.close()
+        self._db.commit()
         self.log_audit(action_type, action_data, "ESCALATE", reason, pending_id=pending_id)
         return pending_id
 
     def log_audit(self, action_type: str, action_data: Dict, decision: str, reason: str, pending_id: Optional[int] = None):
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
         payload = dict(action_data)
         if pending_id is not None:
             payload["pending_id"] = pending_id
-        cur.execute(
-            """
-            INSERT INTO audit_log (timestamp, action_type, action_data, decision, reason, actor)
-            VALUES (?, ?, ?, ?, ?, ?)
-            """,
-            (self._utc_now(), action_type, json.dumps(payload), decision, reason, self.actor)
-        )
-        conn.commit()
-        conn.close()
+        row = {
+            "timestamp": self._utc_now(),
+            "action_type": action_type,
+            "action_data": payload,
+            "decision": decision,
+            "reason": reason,
+            "actor": self.actor
+        }
+        # One write per row: O_APPEND places it atomically at the end of the file
+        os.write(self._audit_fd, _dumpb(row) + b"\n")
+        if decision in SQL_AUDIT_DECISIONS:
+            self._db.execute(
+                _SQL_INSERT_AUDIT,
+                (row["timestamp"], action_type, _dumps(payload), decision, reason, self.actor)
+            )
+            self._db.commit()
+
+    def query_audit(self, limit: int = 20) -> List[Dict]:
+        """Return the newest audit entries from the JSONL log, newest first.
+
+        Torn or malformed lines (e.g. from a writer killed mid-row) are skipped.
+        """
+        with open(self.audit_path, "rb") as handle:
+            lines = deque(handle, maxlen=limit)
+        entries = []
+        for line in reversed(lines):
+            if not line.strip():
+                continue
+            try:
+                entry = _loads(line)
+            except ValueError:
+                continue
+            if isinstance(entry, dict):
+                entries.append(entry)
+        return entries
 
     def list_pending(self) -> List[Dict]:
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, action_type, action_data, proposed_by, proposed_at, status
-            FROM pending_changes
-            WHERE status = 'pending'
-            ORDER BY proposed_at ASC
-            """
-        )
-        rows = cur.fetchall()
-        conn.close()
+        rows = self._db.execute(_SQL_LIST_PENDING).fetchall()
         return [
             {
                 "id": row[0],
                 "action_type": row[1],
-                "action_data": json.loads(row[2]),
+                "action_data": _loads(row[2]),
                 "proposed_by": row[3],
                 "proposed_at": row[4],
                 "status": row[5]
@@ -237,39 +336,24 @@ class ApprovalQueue:
         ]
 
     def approve(self, pending_id: int, reviewer: str, notes: str = "") -> Optional[Dict]:
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            UPDATE pending_changes
-            SET status = 'approved', reviewed_by = ?, reviewed_at = ?, review_notes = ?
-            WHERE id = ? AND status = 'pending'
-            """,
-            (reviewer, self._utc_now(), notes, pending_id)
+        self._db.execute(
+            _SQL_REVIEW_PENDING,
+            ("approved", reviewer, self._utc_now(), notes, pending_id)
         )
-        cur.execute("SELECT action_type, action_data, status FROM pending_changes WHERE id = ?", (pending_id,))
-        row = cur.fetchone()
-        conn.commit()
-        conn.close()
+        row = self._db.execute(_SQL_GET_PENDING, (pending_id,)).fetchone()
+        self._db.commit()
         if row and row[2] == "approved":
-            action_data = json.loads(row[1])
+            action_data = _loads(row[1])
             self.log_audit(row[0], action_data, "APPROVED", f"Approved by {reviewer}: {notes}", pending_id=pending_id)
             return {"action_type": row[0], "action_data": action_data}
         return None
 
     def reject(self, pending_id: int, reviewer: str, notes: str = ""):
-        conn = sqlite3.connect(self.db_path)
-        cur = conn.cursor()
-        cur.execute(
-            """
-            UPDATE pending_changes
-            SET status = 'rejected', reviewed_by = ?, reviewed_at = ?, review_notes = ?
-            WHERE id = ? AND status = 'pending'
-            """,
-            (reviewer, self._utc_now(), notes, pending_id)
+        self._db.execute(
+            _SQL_REVIEW_PENDING,
+            ("rejected", reviewer, self._utc_now(), notes, pending_id)
         )
-        conn.commit()
-        conn.close()
+        self._db.commit()
         self.log_audit("reject", {"pending_id": pending_id}, "REJECTED", f"Rejected by {reviewer}: {notes}", pending_id=pending_id)
 
 
@@ -284,7 +368,8 @@ class CapabilityFirewall:
         actor: str = "agent",
         actor_role: str = "worker",
         allowed_domains: Optional[List[str]] = None,
-        budget: Optional[ExecutionBudget] = None
+        budget: Optional[ExecutionBudget] = None,
+        audit_path: Optional[str] = None
     ):
         if tier not in TIER_ORDER:
             raise ValueError(f"Unknown tier: {tier}")
@@ -293,103 +378,151 @@ class CapabilityFirewall:
         self.actor_role = actor_role
         self.sandbox = WorkspaceSandbox(Path(sandbox_root), allowed_domains=allowed_domains)
         self.budget = budget or ExecutionBudget()
-        self.approvals = ApprovalQueue(Path(db_path), actor=actor)
+        self.approvals = ApprovalQueue(Path(db_path), actor=actor, audit_path=audit_path)
         self.tools = ToolWrappers(self)
 
+    def close(self):
+        self.approvals.close()
+
     def _tier_allows(self, tool_policy: ToolPolicy) -> bool:
         return TIER_ORDER[self.tier] >= TIER_ORDER[tool_policy.tier]
 
     def _audit(self, action_name: str, action_data: Dict, decision: str, reason: str, pending_id: Optional[int] = None):
         self.approvals.log_audit(action_name, action_data, decision, reason, pending_id=pending_id)
 
-    def _escalate(self, action_name: str, action_data: Dict, reason: str) -> Dict:
+    def _escalate(self, action_name: str, action_data: Dict, reason: str, now: Optional[float] = None) -> Dict:
         pending_id = self.approvals.queue(action_name, action_data, reason)
         return {
             "decision": "escalate",
             "reason": reason,
             "pending_id": pending_id,
             "sanitized": action_data,
-            "budget": self.budget.status()
+            "budget": self.budget.status(now)
+        }
+
+    def _deny(self, action_name: str, action_data: Dict, reason: str, now: Optional[float] = None) -> Dict:
+        self._audit(action_name, action_data, "DENY", reason)
+        return {
+            "decision": "deny",
+            "reason": reason,
+            "budget": self.budget.status(now)
         }
 
     def guard_action(self, action: Dict, actor_role: Optional[str] = None, recursion_depth: int = 0) -> Dict:
-        """Validate an action and return allow/escalate/deny with sanitized payload."""
-        role = actor_role or self.actor_role
+        """Validate an action and return allow/escalate/deny with sanitized payload.
+
+        The returned "sanitized" dict is the caller's own action dict when no
+        path needed rewriting, so copy it before mutating.
+        """
+        role = sys.intern(actor_role or self.actor_role)
+        now = time.time()
 
-        ok, budget_reason = self.budget.consume_step(recursion_depth)
+        ok, budget_reason = self.budget.consume_step(recursion_depth, now=now)
         if not ok:
-            self._audit(action.get("action", "unknown"), action, "DENY", budget_reason)
-            return {
-                "decision": "deny",
-                "reason": budget_reason,
-                "budget": self.budget.status()
-            }
+            return self._deny(action.get("action", "unknown"), action, budget_reason, now)
 
         action_name = action.get("action") or action.get("tool")
         if not action_name:
             return {
                 "decision": "deny",
                 "reason": "Missing action name",
-                "budget": self.budget.status()
+                "budget": self.budget.status(now)
             }
+        if isinstance(action_name, str):
+            action_name = sys.intern(action_name)
 
         policy = TOOL_POLICIES.get(action_name)
         if not policy:
-            return self._escalate(action_name, action, "Unknown tool - requires review")
+            return self._escalate(action_name, action, "Unknown tool - requires review", now=now)
+        validator = TOOL_VALIDATORS.get(action_name)
+        # Rebuild when the policy was replaced or edited since it was compiled
+        if validator is None or validator.policy is not policy or vars(policy) != validator.policy_fields:
+            validator = TOOL_VALIDATORS[action_name] = _build_validator(action_name, policy)
+        return validator(self, action, role, recursion_depth, now)
 
-        if role == "head" and policy.tier != "safe":
-            return self._escalate(action_name, action, "Head role restricted to safe tools")
 
-        if not self._tier_allows(policy):
-            return self._escalate(action_name, action, f"{policy.tier} tool requires higher tier than {self.tier}")
+PATH_FIELDS = ("path", "cwd", "dest", "target", "source")
 
-        if recursion_depth > self.budget.max_recursion:
-            self._audit(action_name, action, "DENY", "Recursion depth exceeded")
-            return {
-                "decision": "deny",
-                "reason": "Recursion depth exceeded",
-                "budget": self.budget.status()
-            }
 
-        sanitized = dict(action)
+def _build_validator(action_name: str, policy: ToolPolicy):
+    """Specialize the per-tool part of guard_action for one policy.
+
+    Everything that depends only on the policy (head restriction, tier rank,
+    network check, approval requirement, reason strings) is decided here
+    once, so the returned function runs just the checks that apply. The
+    function carries the policy it was built from so guard_action can tell
+    when it is stale.
+    """
+    head_restricted = policy.tier != "safe"
+    policy_rank = TIER_ORDER[policy.tier]
+    tier_reason = f"{policy.tier} tool requires higher tier than "
+    check_url = action_name == "http_request"
+    allow_domains = policy.allow_domains
+    needs_approval = policy.requires_approval or policy.tier == "dangerous"
+    approval_reason = f"{action_name} requires approval"
+
+    def validate(fw: CapabilityFirewall, action: Dict, role: str, recursion_depth: int, now: float) -> Dict:
+        if head_restricted and role == "head":
+            return fw._escalate(action_name, action, "Head role restricted to safe tools", now=now)
+
+        if TIER_ORDER[fw.tier] < policy_rank:
+            return fw._escalate(action_name, action, tier_reason + fw.tier, now=now)
+
+        if recursion_depth > fw.budget.max_recursion:
+            return fw._deny(action_name, action, "Recursion depth exceeded", now)
+
+        sanitized = None
 
         # Path enforcement
-        for path_field in ("path", "cwd", "dest", "target", "source"):
+        for path_field in PATH_FIELDS:
             if path_field in action:
                 try:
-                    sanitized[path_field] = str(self.sandbox.resolve_path(str(action[path_field])))
+                    resolved = str(fw.sandbox.resolve_path(str(action[path_field])))
                 except PermissionError as e:
-                    self._audit(action_name, action, "DENY", str(e))
-                    return {
-                        "decision": "deny",
-                        "reason": str(e),
-                        "budget": self.budget.status()
-                    }
+                    return fw._deny(action_name, action, str(e), now)
+                if resolved != action[path_field]:
+                    if sanitized is None:
+                        sanitized = dict(action)
+                    sanitized[path_field] = resolved
+        if sanitized is None:
+            sanitized = action
 
         # Network enforcement
-        if action_name in ("http_request",) and "url" in action:
+        if check_url and "url" in action:
             try:
-                self.sandbox.assert_domain_allowed(str(action["url"]), policy.allow_domains)
+                fw.sandbox.assert_domain_allowed(str(action["url"]), allow_domains)
             except PermissionError as e:
-                self._audit(action_name, action, "DENY", str(e))
-                return {
-                    "decision": "deny",
-                    "reason": str(e),
-                    "budget": self.budget.status()
-                }
+                return fw._deny(action_name, action, str(e), now)
 
         # Decide approval vs allow
-        if policy.requires_approval or policy.tier == "dangerous":
-            return self._escalate(action_name, sanitized, f"{action_name} requires approval")
+        if needs_approval:
+            return fw._escalate(action_name, sanitized, approval_reason, now=now)
 
-        self._audit(action_name, sanitized, "ALLOW", f"Allowed in tier {self.tier}")
+        reason = f"Allowed in tier {fw.tier}"
+        fw._audit(action_name, sanitized, "ALLOW", reason)
         return {
             "decision": "allow",
-            "reason": f"Allowed in tier {self.tier}",
+            "reason": reason,
             "sanitized": sanitized,
-            "budget": self.budget.status()
+            "budget": fw.budget.status(now)
         }
 
+    validate.policy = policy
+    validate.policy_fields = copy.deepcopy(vars(policy))
+    return validate
+
+
+def compile_validators() -> Dict[str, Callable]:
+    """Build validators for every entry in TOOL_POLICIES.
+
+    guard_action rebuilds a validator on first use after its policy is added,
+    replaced or edited, and ignores one whose policy was removed.
+    """
+    return {name: _build_validator(name, policy) for name, policy in TOOL_POLICIES.items()}
+
+
+TOOL_VALIDATORS: Dict[str, Callable] = compile_validators()
+
 
 class ToolWrappers:
     """Executes tools with firewall checks."""
@@ -423,7 +556,20 @@ class ToolWrappers:
         if decision["decision"] != "allow":
             return decision
         target = Path(decision["sanitized"]["path"])
-        data = target.read_bytes()[:max_bytes]
+        # Bounded read: never pull more than max_bytes off disk
+        fd = os.open(target, os.O_RDONLY)
+        try:
+            chunks = []
+            remaining = max_bytes
+            while remaining > 0:
+                chunk = os.read(fd, remaining)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+        finally:
+            os.close(fd)
+        data = b"".join(chunks)
         text = data.decode("utf-8", errors="replace")
         return {"decision": "allow", "content": text, "budget": decision["budget"]}
 
@@ -449,6 +595,7 @@ class ToolWrappers:
         if decision["decision"] != "allow":
             return decision
         workdir = Path(decision["sanitized"].get("cwd", self.firewall.sandbox.root))
+        import subprocess
         try:
             result = subprocess.run(
                 cmd,
@@ -473,6 +620,7 @@ class ToolWrappers:
         if decision["decision"] != "allow":
             return decision
         workdir = Path(decision["sanitized"].get("cwd", self.firewall.sandbox.root))
+        import subprocess
         try:
             result = subprocess.run(
                 cmd,
@@ -520,14 +668,12 @@ class ToolWrappers:
             return decision
         target = Path(decision["sanitized"]["path"])
         if target.is_dir():
-            for root, dirs, files in os.walk(target, topdown=False):
-                for fname in files:
-                    Path(root, fname).unlink(missing_ok=True)
-                for dname in dirs:
-                    Path(root, dname).rmdir()
-            target.rmdir()
+            shutil.rmtree(target)
         else:
-            target.unlink(missing_ok=True)
+            try:
+                os.unlink(target)
+            except FileNotFoundError:
+                pass
         return {"decision": "allow", "deleted": str(target), "budget": decision["budget"]}
 
     def spawn_worker(self, objective: str, depth: int) -> Dict:
@@ -538,7 +684,8 @@ class ToolWrappers:
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Capability firewall CLI")
-    parser.add_argument("--db", default="memory.db", help="Path to SQLite db for approvals/audit")
+    parser.add_argument("--db", default="memory.db", help="Path to SQLite db for approvals")
+    parser.add_argument("--audit-log", help="Path to JSONL audit log (default: <db>.audit.jsonl)")
     parser.add_argument("--sandbox", default="/tmp/agent-sandbox", help="Sandbox root directory")
     parser.add_argument("--tier", choices=["safe", "moderate", "dangerous"], default="safe", help="Permission tier")
     parser.add_argument("--actor", default="agent", help="Actor id")
@@ -552,6 +699,9 @@ def parse_args():
 
     sub.add_parser("pending", help="List pending approvals")
 
+    audit_parser = sub.add_parser("audit", help="Show recent audit log entries")
+    audit_parser.add_argument("--limit", type=int, default=20, help="Number of entries")
+
     approve_parser = sub.add_parser("approve", help="Approve a pending change")
     approve_parser.add_argument("id", type=int, help="Pending id")
     approve_parser.add_argument("--reviewer", default="human", help="Reviewer name")
@@ -573,7 +723,8 @@ def main():
         tier=args.tier,
         actor=args.actor,
         actor_role=args.role,
-        allowed_domains=args.allowed_domains
+        allowed_domains=args.allowed_domains,
+        audit_path=args.audit_log
     )
 
     if args.command == "check":
@@ -591,6 +742,15 @@ def main():
                 print(json.dumps(item["action_data"], indent=2)[:200])
                 print()
 
+    elif args.command == "audit":
+        entries = firewall.approvals.query_audit(args.limit)
+        if not entries:
+            print("No audit log entries.")
+        else:
+            for entry in entries:
+                print(f"{entry['timestamp']} [{entry['decision']}] {entry['action_type']} by {entry['actor']}")
+                print(f"    {entry['reason']}")
+
     elif args.command == "approve":
         result = firewall.approvals.approve(args.id, reviewer=args.reviewer, notes=args.notes)
         if result:
@@ -603,6 +763,8 @@ def main():
         firewall.approvals.reject(args.id, reviewer=args.reviewer, notes=args.notes)
         print(f"Rejected {args.id}")
 
+    firewall.close()
+
 
 if __name__ == "__main__":
     main()
@@ -11,14 +11,23 @@ Compares Codex CLI variants on identical coding task:
 Measures: time, output length, code structure quality
 """
 
+import asyncio
 import json
+import os
+import re
+import signal
 import time
-import subprocess
 import sys
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from typing import Optional
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # The coding task - same for all variants
 CODING_TASK = """
 Write a Python function called `parse_duration` that converts human-readable duration strings into total seconds.
@@ -64,52 +73,90 @@ class TestResult:
     output: str = ""
 
 
-def run_codex(model: str, effort: str, prompt: str, timeout: int = 300) -> tuple[str, float, int]:
+# Lines the Codex CLI prints before the model output
+BANNER_PREFIXES = ("OpenAI Codex", "─")
+
+
+async def _read_output(proc: asyncio.subprocess.Process) -> str:
+    """Collect merged stdout/stderr, skipping the version banner"""
+    # Read to EOF rather than by line: a StreamReader line is capped at 64 KiB
+    data = await proc.stdout.read()
+    await proc.wait()
+    lines = data.decode(errors="replace").splitlines(keepends=True)
+    for i, line in enumerate(lines):
+        if not line.startswith(BANNER_PREFIXES) and line.strip():
+            return "".join(lines[i:]).strip()
+    return ""
+
+
+# How long to wait for a killed codex process group to be reaped
+KILL_WAIT_SEC = 5
+
+
+async def _kill(proc: asyncio.subprocess.Process) -> None:
+    """Kill codex and anything it spawned, so no grandchild keeps stdout open"""
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    try:
+        await asyncio.wait_for(proc.wait(), KILL_WAIT_SEC)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def run_codex(model: str, effort: str, prompt: str, timeout: int = 300) -> tuple[str, float, int]:
     """Run codex CLI and return (output, time_sec, exit_code)"""
     cmd = ["codex", "exec", "-m", model, "-c", f"model_reasoning_effort={effort}", "--full-auto", prompt]
 
     start = time.time()
+    proc = None
     try:
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-        elapsed = time.time() - start
-        output = (result.stdout + result.stderr).strip()
-
-        # Strip version banner if present
-        if "OpenAI Codex" in output:
-            lines = output.split("\n")
-            # Find first non-banner line
-            for i, line in enumerate(lines):
-                if not line.startswith("OpenAI Codex") and not line.startswith("─"):
-                    output = "\n".join(lines[i:])
-                    break
-
-        return output, elapsed, result.returncode
-    except subprocess.TimeoutExpired:
-        return f"TIMEOUT after {timeout}s", time.time() - start, -1
+        proc = await asyncio.create_subprocess_exec(
+            *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+            start_new_session=True
+        )
+        try:
+            output = await asyncio.wait_for(_read_output(proc), timeout)
+        except asyncio.TimeoutError:
+            await _kill(proc)
+            return f"TIMEOUT after {timeout}s", time.time() - start, -1
+        return output, time.time() - start, proc.returncode
     except FileNotFoundError:
         return "Codex CLI not found", 0, -1
     except Exception as e:
+        if proc is not None and proc.returncode is None:
+            await _kill(proc)
         return f"ERROR: {e}", time.time() - start, -1
 
 
+# One pass over the output finds every quality marker analyze_output needs
+_MARKER_RE = re.compile(
+    r"(?P<func>def parse_duration)|(?P<doc>\"\"\"|''')|(?P<arrow>->)|(?P<colon>:)|(?P<err>(?i:raise))"
+)
+_ALL_MARKERS = frozenset({"func", "doc", "arrow", "colon", "err"})
+
+
 def analyze_output(output: str) -> dict:
     """Analyze code output for quality markers"""
+    found = set()
+    for match in _MARKER_RE.finditer(output):
+        found.add(match.lastgroup)
+        if found == _ALL_MARKERS:
+            break
     return {
-        "has_function": "def parse_duration" in output,
-        "has_docstring": '"""' in output or "'''" in output,
-        "has_type_hints": "->" in output and ":" in output,
-        "has_error_handling": "raise ValueError" in output or "raise" in output.lower(),
+        "has_function": "func" in found,
+        "has_docstring": "doc" in found,
+        "has_type_hints": "arrow" in found and "colon" in found,
+        "has_error_handling": "err" in found,
     }
 
 
-def run_test(variant: dict) -> TestResult:
+async def run_test(variant: dict) -> TestResult:
     """Run test for a single variant"""
-    print(f"\n{'='*60}")
-    print(f"Testing: {variant['tier']}")
-    print(f"  Model: {variant['model']}, Effort: {variant['effort']}")
-    print(f"{'='*60}")
+    print(f"\nStarted: {variant['tier']} ({variant['model']}, effort={variant['effort']})")
 
-    output, time_sec, exit_code = run_codex(variant["model"], variant["effort"], CODING_TASK)
+    output, time_sec, exit_code = await run_codex(variant["model"], variant["effort"], CODING_TASK)
 
     analysis = analyze_output(output)
 
@@ -128,6 +175,10 @@ def run_test(variant: dict) -> TestResult:
         output=output[:2000] if exit_code == 0 else "",
     )
 
+    print(f"\n{'='*60}")
+    print(f"Testing: {variant['tier']}")
+    print(f"  Model: {variant['model']}, Effort: {variant['effort']}")
+    print(f"{'='*60}")
     print(f"  Time: {result.time_sec}s")
     print(f"  Output length: {result.output_len} chars")
     print(f"  Has function: {result.has_function}")
@@ -141,17 +192,18 @@ def run_test(variant: dict) -> TestResult:
     return result
 
 
+async def run_all(variants: list[dict]) -> list[TestResult]:
+    """Run every variant concurrently; results keep the order of variants"""
+    return list(await asyncio.gather(*(run_test(v) for v in variants)))
+
+
 def main():
     print("\n" + "="*70)
     print("CODEX VARIANT COMPARISON TEST")
     print("Task: Implement parse_duration() function")
     print("="*70)
 
-    results = []
-
-    for variant in VARIANTS:
-        result = run_test(variant)
-        results.append(result)
+    results = asyncio.run(run_all(VARIANTS))
 
     # Summary
     print("\n" + "="*70)
@@ -182,18 +234,24 @@ def main():
 
     # Save results
     output_file = Path("/tmp/codex_comparison_results.json")
-    with open(output_file, "w") as f:
-        json.dump([asdict(r) for r in results], f, indent=2)
+    # TestResult holds only primitives, so its __dict__ serializes as-is
+    data = [r.__dict__ for r in results]
+    if HAS_ORJSON:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+    output_file.write_bytes(payload)
     print(f"\nResults saved to: {output_file}")
 
     # Save individual outputs
     for r in results:
         if r.output:
             out_file = Path(f"/tmp/codex_output_{r.tier.replace('-', '_')}.py")
-            with open(out_file, "w") as f:
-                f.write(f"# Generated by {r.tier} ({r.model}, effort={r.effort})\n")
-                f.write(f"# Time: {r.time_sec}s\n\n")
-                f.write(r.output)
+            out_file.write_text(
+                f"# Generated by {r.tier} ({r.model}, effort={r.effort})\n"
+                f"# Time: {r.time_sec}s\n\n"
+                f"{r.output}"
+            )
             print(f"Output saved: {out_file}")
 
     return results
@@ -14,10 +14,24 @@ import json
 import argparse
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator
 from dataclasses import dataclass
 import statistics
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Both parsers accept the raw bytes of a line, so the log is read in binary mode
+_loads = orjson.loads if HAS_ORJSON else json.loads
+
+# Report row templates, shared by every scenario in a report
+TIER_LINE_TPL = "    %-15s: %5d calls (%5.1f%%)"
+ACTION_LINE_TPL = "  %-20s: $%7.2f → $%7.2f (save $%.2f, %.0f%%)"
+CHART_LINE_TPL = "%-20s $%6.2f %-20s $%6.2f %-20s %5.1f%%"
+
 
 @dataclass
 class CostScenario:
@@ -83,18 +97,37 @@ class CostAnalyzer:
         "unknown": "claude-sonnet-4.5"
     }
 
+    # Hybrid tier each model belongs to (for tier_stats)
+    MODEL_TO_TIER = {
+        "phi3-mini": "local_fast",
+        "llama3-8b": "local_fast",
+        "mixtral-8x7b": "local_quality",
+        "codestral": "local_quality",
+        "llama3-70b": "local_quality",
+        "claude-sonnet-4.5": "api_fallback",
+        "claude-haiku": "api_fallback",
+        "gpt-4o": "api_fallback"
+    }
+
     # Fallback rate (% of local calls that fail and use API)
     FALLBACK_RATE = 0.05  # 5% fallback to API
 
     def __init__(self):
         self.usage_log = []
+        # Tokens per action in thousands, matching the per-1K MODEL_COSTS rates
+        self._action_ktokens = {action: tokens / 1000 for action, tokens in self.ACTION_TOKENS.items()}
 
-    def load_usage_log(self, log_path: str):
-        """Load usage log from JSONL file"""
-        with open(log_path) as f:
+    def iter_usage_log(self, log_path: str) -> Iterator[Dict[str, Any]]:
+        """Yield usage log entries one at a time from a JSONL file"""
+        loads = _loads
+        with open(log_path, "rb") as f:
             for line in f:
                 if line.strip():
-                    self.usage_log.append(json.loads(line))
+                    yield loads(line)
+
+    def load_usage_log(self, log_path: str):
+        """Load usage log from JSONL file"""
+        self.usage_log.extend(self.iter_usage_log(log_path))
 
     def calculate_pure_api_cost(
         self,
@@ -105,27 +138,21 @@ class CostAnalyzer:
     ) -> Dict[str, Any]:
         """Calculate cost for pure API usage"""
 
-        total_cost = 0.0
-        daily_costs = []
-        action_costs = {}
-
-        for day in range(days):
-            day_cost = 0.0
-
-            for action_type, percentage in action_distribution.items():
-                action_count = int(iterations_per_day * percentage)
-                tokens = self.ACTION_TOKENS.get(action_type, 800)
-                cost_per_action = (tokens / 1000) * self.MODEL_COSTS[api_model]
-                action_total = action_count * cost_per_action
+        # Nothing in the per-action math depends on the day, so price a single
+        # day once and scale it, rather than repeating it for every day
+        action_ktokens = self._action_ktokens
+        api_model_cost = self.MODEL_COSTS[api_model]
 
-                day_cost += action_total
+        action_day_costs = {}
+        for action_type, percentage in action_distribution.items():
+            action_count = int(iterations_per_day * percentage)
+            cost_per_action = action_ktokens.get(action_type, 0.8) * api_model_cost
+            action_day_costs[action_type] = action_count * cost_per_action
 
-                if action_type not in action_costs:
-                    action_costs[action_type] = 0.0
-                action_costs[action_type] += action_total
-
-            daily_costs.append(day_cost)
-            total_cost += day_cost
+        day_cost = sum(action_day_costs.values())
+        daily_costs = [day_cost] * days
+        total_cost = day_cost * days
+        action_costs = {action: cost * days for action, cost in action_day_costs.items()}
 
         return {
             "model": api_model,
@@ -145,51 +172,51 @@ class CostAnalyzer:
     ) -> Dict[str, Any]:
         """Calculate cost for hybrid architecture"""
 
-        total_cost = 0.0
-        daily_costs = []
-        action_costs = {}
-        tier_stats = {"local_fast": 0, "local_quality": 0, "api_fallback": 0}
-
-        for day in range(days):
-            day_cost = 0.0
-
-            for action_type, percentage in action_distribution.items():
-                action_count = int(iterations_per_day * percentage)
-                tokens = self.ACTION_TOKENS.get(action_type, 800)
-
-                # Get primary model for this action
-                primary_model = self.HYBRID_TIER_MAPPING.get(action_type, fallback_model)
-                primary_cost = (tokens / 1000) * self.MODEL_COSTS[primary_model]
-
-                # Calculate cost with fallback
-                if self.MODEL_COSTS[primary_model] == 0.0:
-                    # Local model with fallback rate
-                    fallback_cost = (tokens / 1000) * self.MODEL_COSTS[fallback_model]
-                    action_cost_per_call = (
-                        primary_cost * (1 - self.FALLBACK_RATE) +
-                        fallback_cost * self.FALLBACK_RATE
-                    )
-
-                    # Track tier usage
-                    if primary_model in ["phi3-mini", "llama3-8b"]:
-                        tier_stats["local_fast"] += action_count
-                    else:
-                        tier_stats["local_quality"] += action_count
-                    tier_stats["api_fallback"] += int(action_count * self.FALLBACK_RATE)
-                else:
-                    # API model
-                    action_cost_per_call = primary_cost
-                    tier_stats["api_fallback"] += action_count
-
-                action_total = action_count * action_cost_per_call
-                day_cost += action_total
-
-                if action_type not in action_costs:
-                    action_costs[action_type] = 0.0
-                action_costs[action_type] += action_total
-
-            daily_costs.append(day_cost)
-            total_cost += day_cost
+        # Price a single day per action, then scale by days (see calculate_pure_api_cost)
+        model_costs = self.MODEL_COSTS
+        action_ktokens = self._action_ktokens
+        tier_map = self.HYBRID_TIER_MAPPING
+        model_tiers = self.MODEL_TO_TIER
+        fallback_rate = self.FALLBACK_RATE
+        local_rate = 1 - fallback_rate
+        fallback_model_cost = model_costs[fallback_model]
+
+        action_day_costs = {}
+        day_tier_stats = {"local_fast": 0, "local_quality": 0, "api_fallback": 0}
+
+        for action_type, percentage in action_distribution.items():
+            action_count = int(iterations_per_day * percentage)
+            ktokens = action_ktokens.get(action_type, 0.8)
+
+            # Get primary model for this action
+            primary_model = tier_map.get(action_type, fallback_model)
+            primary_model_cost = model_costs[primary_model]
+            primary_cost = ktokens * primary_model_cost
+
+            # Calculate cost with fallback
+            if primary_model_cost == 0.0:
+                # Local model with fallback rate
+                fallback_cost = ktokens * fallback_model_cost
+                action_cost_per_call = (
+                    primary_cost * local_rate +
+                    fallback_cost * fallback_rate
+                )
+
+                # Track tier usage
+                day_tier_stats[model_tiers.get(primary_model, "local_quality")] += action_count
+                day_tier_stats["api_fallback"] += int(action_count * fallback_rate)
+            else:
+                # API model
+                action_cost_per_call = primary_cost
+                day_tier_stats["api_fallback"] += action_count
+
+            action_day_costs[action_type] = action_count * action_cost_per_call
+
+        day_cost = sum(action_day_costs.values())
+        daily_costs = [day_cost] * days
+        total_cost = day_cost * days
+        action_costs = {action: cost * days for action, cost in action_day_costs.items()}
+        tier_stats = {tier: count * days for tier, count in day_tier_stats.items()}
 
         return {
             "total_cost": total_cost,
@@ -232,19 +259,17 @@ class CostAnalyzer:
             "savings_pct": savings_pct
         }
 
-    def generate_report(self, scenarios: List[CostScenario], days: int = 30):
-        """Generate comprehensive cost comparison report"""
+    def generate_report(self, comparisons: List[Dict[str, Any]]):
+        """Generate comprehensive cost comparison report from compare_scenarios results"""
 
         print("=" * 80)
         print("HYBRID LLM ARCHITECTURE - COST ANALYSIS REPORT")
         print("=" * 80)
         print()
 
-        for scenario in scenarios:
-            comparison = self.compare_scenarios(scenario, days)
-
+        for comparison in comparisons:
             print(f"Scenario: {comparison['scenario']}")
-            print(f"Duration: {days} days")
+            print(f"Duration: {comparison['days']} days")
             print(f"Iterations: {comparison['iterations_per_day']}/day")
             print()
 
@@ -269,7 +294,7 @@ class CostAnalyzer:
             print("  Tier Distribution:")
             for tier, count in hybrid['tier_stats'].items():
                 pct = (count / total_calls * 100) if total_calls > 0 else 0
-                print(f"    {tier:15s}: {count:5d} calls ({pct:5.1f}%)")
+                print(TIER_LINE_TPL % (tier, count, pct))
             print()
 
             # Savings
@@ -289,23 +314,20 @@ class CostAnalyzer:
                 hybrid_cost = hybrid['action_breakdown'].get(action, 0)
                 action_savings = cost - hybrid_cost
                 action_savings_pct = (action_savings / cost * 100) if cost > 0 else 0
-                print(f"  {action:20s}: ${cost:7.2f} → ${hybrid_cost:7.2f} "
-                      f"(save ${action_savings:.2f}, {action_savings_pct:.0f}%)")
+                print(ACTION_LINE_TPL % (action, cost, hybrid_cost, action_savings, action_savings_pct))
             print()
 
             print("-" * 80)
             print()
 
-    def generate_ascii_chart(self, scenarios: List[CostScenario], days: int = 30):
-        """Generate ASCII cost comparison chart"""
+    def generate_ascii_chart(self, comparisons: List[Dict[str, Any]]):
+        """Generate ASCII cost comparison chart from compare_scenarios results"""
 
         print("=" * 80)
         print("COST COMPARISON CHART")
         print("=" * 80)
         print()
 
-        comparisons = [self.compare_scenarios(s, days) for s in scenarios]
-
         # Find max cost for scaling
         max_cost = max(c["pure_api"]["total_cost"] for c in comparisons)
 
@@ -325,8 +347,7 @@ class CostAnalyzer:
             pure_bar = "█" * pure_bar_len
             hybrid_bar = "█" * hybrid_bar_len
 
-            print(f"{scenario:<20s} ${pure_cost:6.2f} {pure_bar:<20s} "
-                  f"${hybrid_cost:6.2f} {hybrid_bar:<20s} {savings_pct:5.1f}%")
+            print(CHART_LINE_TPL % (scenario, pure_cost, pure_bar, hybrid_cost, hybrid_bar, savings_pct))
 
         print()
 
@@ -436,9 +457,10 @@ def main():
             )
         ]
 
-        # Generate reports
-        analyzer.generate_report(scenarios, args.days)
-        analyzer.generate_ascii_chart(scenarios, args.days)
+        # Generate reports (each scenario is priced once and shared by both)
+        comparisons = [analyzer.compare_scenarios(s, args.days) for s in scenarios]
+        analyzer.generate_report(comparisons)
+        analyzer.generate_ascii_chart(comparisons)
 
         # Recommendations
         print("=" * 80)
@@ -14,48 +14,97 @@ import sqlite3
 import json
 import os
 import argparse
+import heapq
 from datetime import datetime
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, groupby
+from operator import itemgetter
+from pathlib import Path
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+if HAS_ORJSON:
+    _dumpb = orjson.dumps
+else:
+    def _dumpb(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
 
 # Configuration
 DB_PATH = os.environ.get("MEMORY_DB", "memory.db")
 OUTPUT_FILE = "training_data.jsonl"
 ONBOARD_DIR = "onboard"
-
+ONBOARD_WRITERS = 8  # Threads writing onboarding prompt files
 
 def get_db_connection():
     if not os.path.exists(DB_PATH):
         print(f"Error: Database not found at {DB_PATH}")
         return None
+    # Lesson scans are served by idx_chunks_lessons (created by mem-db.sh migrate)
     return sqlite3.connect(DB_PATH)
 
 
+def _clean_lesson(text: str) -> str:
+    """Strip the [LESSON] glyph and surrounding whitespace from a lesson"""
+    return (text or "").replace("[LESSON]", "").strip()
+
+
 def fetch_lessons(topic_filter: str = None):
-    """Fetch lessons from database, optionally filtered by topic"""
+    """Yield lesson rows from database, optionally filtered by topic"""
     conn = get_db_connection()
     if not conn:
-        return []
+        return
 
-    cursor = conn.cursor()
+    try:
+        yield from _iter_lesson_rows(conn.cursor(), topic_filter)
+    finally:
+        conn.close()
+
+
+def _iter_lesson_rows(cursor, topic_filter: str = None):
+    """
+    Stream (topic, text, timestamp, task_id) rows in fetchmany batches.
 
+    Rows come ordered by topic then time. Untopiced lessons are grouped
+    under "general"; when there are any, that group (NULL/empty topics, then
+    any literal "general") is fetched first, where they sort, so every
+    topic's rows are contiguous. Otherwise a literal "general" keeps its
+    sorted place.
+    """
+    where = "anchor_type='L'"
+    params = ()
     if topic_filter:
-        cursor.execute("""
-            SELECT anchor_topic, text, timestamp, task_id
-            FROM chunks
-            WHERE anchor_type='L' AND anchor_topic LIKE ?
-            ORDER BY anchor_topic, timestamp ASC
-        """, (f"%{topic_filter}%",))
+        where += " AND anchor_topic LIKE ?"
+        params = (f"%{topic_filter}%",)
+
+    cursor.execute(f"SELECT 1 FROM chunks WHERE {where} AND COALESCE(anchor_topic, '') = '' LIMIT 1", params)
+    if cursor.fetchone():
+        parts = ("COALESCE(anchor_topic, '') IN ('', 'general')", "anchor_topic NOT IN ('', 'general')")
     else:
-        cursor.execute("""
+        parts = ("1",)
+
+    for part in parts:
+        cursor.execute(f"""
             SELECT anchor_topic, text, timestamp, task_id
             FROM chunks
-            WHERE anchor_type='L'
+            WHERE {where} AND {part}
             ORDER BY anchor_topic, timestamp ASC
-        """)
+        """, params)
 
-    rows = cursor.fetchall()
-    conn.close()
-    return rows
+        cursor.arraysize = 1000
+        while True:
+            batch = cursor.fetchmany()
+            if not batch:
+                break
+            yield from batch
+
+
+def _lesson_topic(row) -> str:
+    """groupby key for lesson rows: the topic, or "general" when it has none"""
+    return row[0] or "general"
 
 
 def format_for_training(topic: str, lessons: list) -> dict:
@@ -63,15 +112,8 @@ def format_for_training(topic: str, lessons: list) -> dict:
     Formats a set of lessons into a training example.
     Format: User asks for advice on [Topic], Assistant provides compiled wisdom.
     """
-    # Construct the "Wisdom" block
-    wisdom_lines = []
-    for lesson in lessons:
-        # Clean the lesson text
-        text = lesson.replace("[LESSON]", "").strip()
-        if text:
-            wisdom_lines.append(f"- {text}")
-
-    wisdom = "\n".join(wisdom_lines)
+    # Construct the "Wisdom" block from the non-empty cleaned lessons
+    wisdom = "\n".join(f"- {text}" for text in map(_clean_lesson, lessons) if text)
 
     # Create a chat-style training example (Llama 3 / OpenAI format)
     return {
@@ -99,35 +141,39 @@ def generate_training_data(topic_filter: str = None, output_file: str = None):
     print(f"--- Dreaming (Consolidating Memories) ---")
     print(f"Database: {DB_PATH}")
 
-    rows = fetch_lessons(topic_filter)
+    # Rows arrive grouped by topic and oldest first within each topic
+    groups = [
+        (topic, [row[1] for row in rows])
+        for topic, rows in groupby(fetch_lessons(topic_filter), key=_lesson_topic)
+    ]
 
-    if not rows:
+    if not groups:
         print("No lessons found. Run more agents!")
         return
 
-    # Group by Topic
-    topic_map = defaultdict(list)
-    for topic, text, ts, task_id in rows:
-        t = topic or "general"
-        topic_map[t].append(text)
-
-    print(f"Found {len(rows)} lessons across {len(topic_map)} topics")
+    total = sum(len(lessons) for _, lessons in groups)
+    print(f"Found {total} lessons across {len(groups)} topics")
+
+    # Generate training examples, streaming each one to the JSONL file
+    written = 0
+    with open(output_file, 'wb', buffering=1 << 20) as f:
+        for topic, lessons in groups:
+            count = len(lessons)
+            if count >= 2:  # Only topics with 2+ lessons
+                example = format_for_training(topic, lessons)
+                f.write(_dumpb(example))
+                f.write(b"\n")
+                written += 1
+                print(f"  [{topic}] {count} lessons")
 
-    # Generate training examples
-    examples = []
-    for topic, lessons in topic_map.items():
-        if len(lessons) >= 2:  # Only topics with 2+ lessons
-            example = format_for_training(topic, lessons)
-            examples.append(example)
-            print(f"  [{topic}] {len(lessons)} lessons")
+    print(f"\n--- Training data written to {output_file} ---")
+    print(f"    {written} training examples generated")
 
-    # Write to JSONL
-    with open(output_file, 'w', encoding='utf-8') as f:
-        for example in examples:
-            f.write(json.dumps(example) + "\n")
 
-    print(f"\n--- Training data written to {output_file} ---")
-    print(f"    {len(examples)} training examples generated")
+def _write_prompt(item):
+    """Write one (filepath, content) onboarding prompt"""
+    filepath, content = item
+    Path(filepath).write_text(content, encoding='utf-8')
 
 
 def generate_onboarding_prompts():
@@ -137,24 +183,19 @@ def generate_onboarding_prompts():
     """
     print(f"--- Generating Onboarding Prompts ---")
 
-    rows = fetch_lessons()
-    if not rows:
+    # Rows arrive grouped by topic, so stream one topic at a time
+    groups = groupby(fetch_lessons(), key=_lesson_topic)
+    first = next(groups, None)
+    if first is None:
         print("No lessons found.")
         return
 
-    # Group by topic
-    topic_map = defaultdict(list)
-    for topic, text, ts, task_id in rows:
-        t = topic or "general"
-        clean_text = text.replace("[LESSON]", "").strip()
-        if clean_text:
-            topic_map[t].append(clean_text)
-
-    # Create onboard directory
-    os.makedirs(ONBOARD_DIR, exist_ok=True)
-
-    for topic, lessons in topic_map.items():
-        if len(lessons) < 1:
+    # Build every prompt first; a later topic mapping to the same file wins
+    prompts = {}
+    created = []
+    for topic, rows in chain((first,), groups):
+        lessons = [text for text in map(_clean_lesson, map(itemgetter(1), rows)) if text]
+        if not lessons:
             continue
 
         # Create onboarding prompt
@@ -174,13 +215,18 @@ def generate_onboarding_prompts():
             ""
         ])
 
-        # Write to file
         safe_topic = topic.replace("/", "-").replace("\\", "-")
         filepath = os.path.join(ONBOARD_DIR, f"onboard_{safe_topic}.md")
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write("\n".join(prompt_lines))
+        prompts[filepath] = "\n".join(prompt_lines)
+        created.append((filepath, len(lessons)))
+
+    # Create onboard directory and write the files concurrently
+    os.makedirs(ONBOARD_DIR, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=ONBOARD_WRITERS) as pool:
+        list(pool.map(_write_prompt, prompts.items()))
 
-        print(f"  Created: {filepath} ({len(lessons)} lessons)")
+    for filepath, count in created:
+        print(f"  Created: {filepath} ({count} lessons)")
 
     print(f"\n--- Onboarding prompts written to {ONBOARD_DIR}/ ---")
 
@@ -190,34 +236,37 @@ def show_stats():
     print(f"--- Lesson Statistics ---")
     print(f"Database: {DB_PATH}")
 
-    rows = fetch_lessons()
-    if not rows:
+    # Rows arrive grouped by topic; keep (text, timestamp, task_id) per topic
+    topics = [
+        (topic, [row[1:] for row in rows])
+        for topic, rows in groupby(fetch_lessons(), key=_lesson_topic)
+    ]
+    total = sum(len(lessons) for _, lessons in topics)
+
+    if not total:
         print("No lessons found.")
         return
 
-    # Group by topic
-    topic_map = defaultdict(list)
-    for topic, text, ts, task_id in rows:
-        t = topic or "general"
-        topic_map[t].append((text, ts, task_id))
-
-    print(f"\nTotal lessons: {len(rows)}")
-    print(f"Topics: {len(topic_map)}\n")
+    print(f"\nTotal lessons: {total}")
+    print(f"Topics: {len(topics)}\n")
 
-    # Sort by lesson count
-    sorted_topics = sorted(topic_map.items(), key=lambda x: len(x[1]), reverse=True)
+    # Top topics by lesson count
+    top_topics = heapq.nlargest(15, topics, key=lambda x: len(x[1]))
 
     print("Top topics by lesson count:")
-    for topic, lessons in sorted_topics[:15]:
+    for topic, lessons in top_topics:
         task_ids = set(l[2] for l in lessons if l[2])
         print(f"  [{topic:20}] {len(lessons):3} lessons ({len(task_ids)} tasks)")
 
     # Recent lessons
     print("\nMost recent lessons:")
-    all_lessons = [(t, text, ts) for t, lessons in topic_map.items() for text, ts, _ in lessons]
-    all_lessons.sort(key=lambda x: x[2] or "", reverse=True)
+    recent = heapq.nlargest(
+        5,
+        ((t, text, ts) for t, lessons in topics for text, ts, _ in lessons),
+        key=lambda x: x[2] or ""
+    )
 
-    for topic, text, ts in all_lessons[:5]:
+    for topic, text, ts in recent:
         short_text = text[:60].replace("\n", " ")
         print(f"  [{ts[:16]}] [{topic}] {short_text}...")
 
@@ -30,14 +30,40 @@ CLI:
 """
 
 import argparse
+import atexit
+import functools
+import hashlib
 import json
+import queue
 import re
 import sqlite3
 import subprocess
 import sys
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Compact JSON for audit_log / pending_changes rows
+if HAS_ORJSON:
+    _loads = orjson.loads
+
+    def _dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+else:
+    _loads = json.loads
+
+    def _dumps(obj) -> str:
+        return json.dumps(obj, separators=(',', ':'))
 
 SCRIPT_DIR = Path(__file__).parent.resolve()
 MEM_DB_SCRIPT = SCRIPT_DIR / "mem-db.sh"
@@ -78,6 +104,243 @@ DENY_ACTIONS = {
     'truncate': 'Bulk deletion not allowed'
 }
 
+# Technology mentions in edit_file content (matched against lowercased text)
+TECH_TERMS = (
+    'jquery', 'react', 'vue', 'angular', 'preact', 'svelte',
+    'python', 'javascript', 'typescript', 'rust', 'go', 'java',
+    'postgres', 'mysql', 'sqlite', 'mongodb', 'redis',
+    'aws', 'gcp', 'azure', 'docker', 'kubernetes',
+)
+
+# Match-frequency ordering of TECH_TERMS written by profile_tech_patterns.py
+TECH_PATTERNS_FILE = SCRIPT_DIR / "governor_patterns.json"
+
+
+def compile_tech_re(terms=TECH_TERMS) -> re.Pattern:
+    """Word-bounded alternation over terms, tried in the given order"""
+    return re.compile(r'\b(' + '|'.join(map(re.escape, terms)) + r')\b')
+
+
+def load_tech_terms(path: Path = TECH_PATTERNS_FILE) -> Tuple[str, ...]:
+    """
+    TECH_TERMS, most frequently matched first when a profile exists at path.
+    The profile only reorders: unknown terms are ignored and unprofiled
+    ones are kept at the end, so the set of matches never changes.
+    """
+    try:
+        profiled = _loads(path.read_bytes()).get('terms', [])
+    except (OSError, ValueError, AttributeError):
+        return TECH_TERMS
+    known = set(TECH_TERMS)
+    ordered = list(dict.fromkeys(t for t in profiled if t in known))
+    ordered.extend(t for t in TECH_TERMS if t not in ordered)
+    return tuple(ordered)
+
+
+_TECH_RE = compile_tech_re(load_tech_terms())
+
+# Language in a Decision/Lesson that marks it as a prohibition
+_PROHIBITION_RE = re.compile(
+    r'\b(ban|banned|prohibit|forbidden|never|avoid|don\'t|do not|must not'
+    r'|deprecated|removed|replaced|migrated away from'
+    r'|security risk|vulnerability|unsafe|insecure)\b',
+    re.IGNORECASE
+)
+
+
+# Actions checked against memory constraints
+CONSTRAINT_ACTIONS = frozenset({'edit_file', 'exec', 'http_request'})
+
+# action_data fields that memory-constraint checks depend on, and how many
+# distinct checks Governor remembers
+CONSTRAINT_FIELDS = ('action', 'content', 'path', 'cmd', 'url')
+CONSTRAINT_CACHE_SIZE = 2048
+
+# Display names for constraint anchor types (see get_constraints)
+CONSTRAINT_TYPE_LABELS = {
+    'd': 'Decision', 'D': 'Decision',
+    'L': 'Lesson'
+}
+
+# Bumped by triggers on every Decision/Lesson insert, update or delete. Created
+# by mem-db.sh and, best-effort, by Governor itself; where it cannot exist
+# (read-only database) PRAGMA data_version (any commit by another connection)
+# stands in
+_SQL_CONSTRAINT_GENERATION = "SELECT generation FROM constraint_generation WHERE id = 1"
+
+_SQL_CREATE_CONSTRAINT_GENERATION = (
+    """
+    CREATE TABLE IF NOT EXISTS constraint_generation (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        generation INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO constraint_generation (id, generation) VALUES (1, 0)",
+) + tuple(
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON chunks WHEN {condition}
+    BEGIN
+        UPDATE constraint_generation SET generation = generation + 1 WHERE id = 1;
+    END
+    """
+    for name, event, condition in (
+        ("chunks_constraints_ai", "INSERT", "new.anchor_type IN ('d', 'D', 'L')"),
+        ("chunks_constraints_ad", "DELETE", "old.anchor_type IN ('d', 'D', 'L')"),
+        ("chunks_constraints_au", "UPDATE",
+         "old.anchor_type IN ('d', 'D', 'L') OR new.anchor_type IN ('d', 'D', 'L')"),
+    )
+)
+
+# Decision/Lesson rows for the in-memory constraint view, newest first
+# (served in order by idx_chunks_constraints)
+_SQL_SELECT_CONSTRAINT_ROWS = """
+    SELECT id, anchor_type, anchor_topic, text, anchor_choice, importance
+    FROM chunks
+    WHERE anchor_type IN ('d', 'D', 'L')
+    ORDER BY timestamp DESC
+"""
+
+# Partial index over Decision/Lesson rows for constraint search and listing
+_SQL_INDEX_CONSTRAINTS = """
+    CREATE INDEX IF NOT EXISTS idx_chunks_constraints
+    ON chunks(anchor_type, timestamp DESC) WHERE anchor_type IN ('d', 'D', 'L')
+"""
+
+# Max audit rows the ingest thread writes per executemany/commit
+AUDIT_BATCH_SIZE = 512
+
+# Longest flush() waits on a live audit thread before giving up
+AUDIT_FLUSH_TIMEOUT = 30.0
+
+# Attempts per audit batch (e.g. while another writer holds the lock past
+# busy_timeout) before its rows are reported on stderr instead
+AUDIT_WRITE_ATTEMPTS = 3
+
+# Decisions whose audit row must be committed before check_action returns
+AUDIT_SYNC_DECISIONS = frozenset({'DENY'})
+
+# Statements run on every governed action; kept as constants so the
+# connections' statement caches reuse the prepared forms
+_SQL_INSERT_PENDING = """
+    INSERT INTO pending_changes (action_type, action_data, proposed_by, proposed_at, status)
+    VALUES (?, ?, ?, ?, 'pending')
+"""
+
+_SQL_INSERT_AUDIT = """
+    INSERT INTO audit_log (timestamp, action_type, action_data, decision, reason, actor)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# Served in order by idx_pending_status_time (see mem-db.sh)
+_SQL_SELECT_PENDING = """
+    SELECT id, action_type, action_data, proposed_by, proposed_at
+    FROM pending_changes
+    WHERE status = 'pending'
+    ORDER BY proposed_at ASC
+"""
+
+# Served newest-first by idx_audit_time (see mem-db.sh) without a sort
+_SQL_SELECT_AUDIT = """
+    SELECT timestamp, action_type, decision, reason, actor
+    FROM audit_log
+    ORDER BY timestamp DESC
+    LIMIT ?
+"""
+
+_SQL_SELECT_CONSTRAINTS = """
+    SELECT id, anchor_type, anchor_topic, text, anchor_choice, importance, timestamp
+    FROM chunks
+    WHERE anchor_type IN ('d', 'D', 'L')
+    ORDER BY
+        CASE importance
+            WHEN 'H' THEN 1
+            WHEN 'M' THEN 2
+            WHEN 'L' THEN 3
+            ELSE 4
+        END,
+        timestamp DESC
+    LIMIT ?
+"""
+
+_SQL_APPROVE = """
+    UPDATE pending_changes
+    SET status = 'approved', reviewed_by = ?, reviewed_at = ?, review_notes = ?
+    WHERE id = ? AND status = 'pending'
+"""
+_SQL_APPROVE_RETURNING = _SQL_APPROVE + " RETURNING action_type, action_data"
+
+_SQL_REJECT = """
+    UPDATE pending_changes
+    SET status = 'rejected', reviewed_by = ?, reviewed_at = ?, review_notes = ?
+    WHERE id = ? AND status = 'pending'
+"""
+
+# UPDATE ... RETURNING needs SQLite 3.35+
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# DENY_ACTIONS match anywhere in the action name; one regex scans for all of them
+_DENY_RE = re.compile("|".join(map(re.escape, DENY_ACTIONS)), re.IGNORECASE)
+_DENY_REASONS = {k.lower(): v for k, v in DENY_ACTIONS.items()}
+
+
+def _build_action_rule(action: str):
+    """
+    Specialize the ESCALATE/ALLOW tables for one action into a closure
+    mapping action_data -> (decision, reason).
+    """
+    escalate = ESCALATE_ACTIONS.get(action)
+    allow = ALLOW_ACTIONS.get(action)
+    unknown = ('ESCALATE', f"Unknown action '{action}' requires review")
+
+    if escalate is not None and 'types' not in escalate:
+        result = ('ESCALATE', escalate.get('description', 'Requires review'))
+        return lambda action_data: result
+
+    escalate_types = tuple(escalate['types']) if escalate is not None else ()
+    if allow is None:
+        allowed, allow_types = unknown, None
+    else:
+        allowed = ('ALLOW', allow.get('description', 'Allowed'))
+        allow_types = tuple(allow['types']) if 'types' in allow else None
+        if allow_types is None and not escalate_types:
+            return lambda action_data: allowed
+
+    def rule(action_data):
+        if escalate_types:
+            entry_type = action_data.get('type', 'n')
+            if entry_type in escalate_types:
+                return 'ESCALATE', f"Decision writes (type={entry_type}) require human review"
+        if allow_types is None or action_data.get('type', '') in allow_types:
+            return allowed
+        return unknown
+
+    return rule
+
+
+def compile_action_rules() -> Dict[str, Any]:
+    """Build the per-action rule table from ALLOW_ACTIONS and ESCALATE_ACTIONS"""
+    return {action: _build_action_rule(action) for action in {**ALLOW_ACTIONS, **ESCALATE_ACTIONS}}
+
+
+ACTION_RULES = compile_action_rules()
+
+
+@functools.lru_cache(maxsize=256)
+def _url_host(url: str) -> Optional[str]:
+    """Hostname of an http(s) URL, without userinfo or port"""
+    try:
+        parts = urlsplit(url)
+    except ValueError:  # e.g. unbalanced IPv6 brackets
+        return None
+    if parts.scheme not in ('http', 'https'):
+        return None
+    return parts.hostname
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO-8601 string with a Z suffix"""
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+
 
 class Governor:
     """Action classification, memory enforcement, and safety gatekeeper"""
@@ -87,34 +350,185 @@ class Governor:
         self.actor = 'governor'
         self.unrestricted = unrestricted
         self.enforce_memory = enforce_memory  # Enable memory constraint checking
+        # One connection for the Governor's lifetime; autocommit unless a batch
+        # opens an explicit transaction (see check_actions)
+        self._conn = sqlite3.connect(
+            db_path, isolation_level=None, check_same_thread=False, cached_statements=256
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+        self._conn.execute("PRAGMA mmap_size=268435456")  # read up to 256 MB via mmap
+        self._conn.execute("PRAGMA temp_store=MEMORY")  # ORDER BY sorts stay off disk
+        # Rows are indexable by column name without building a dict per row
+        self._conn.row_factory = sqlite3.Row
+        try:
+            self._conn.execute(_SQL_INDEX_CONSTRAINTS)
+        except sqlite3.Error:
+            pass  # read-only or pre-migration database; queries still work unindexed
+        try:
+            # Same counter and triggers as mem-db.sh migrate, so databases that
+            # were never re-migrated still get a memo key audit writes don't bump
+            self._conn.execute("BEGIN")
+            for sql in _SQL_CREATE_CONSTRAINT_GENERATION:
+                self._conn.execute(sql)
+            self._conn.execute("COMMIT")
+        except sqlite3.Error:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+
+        # Memoized constraint checks (see _cached_constraint_check)
+        self._constraint_cache = OrderedDict()
+        self._constraints_version = 0
+        # Constraint changes are tracked by the trigger-maintained counter
+        # whenever it could be created (see _constraints_state)
+        self._has_generation = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'constraint_generation'"
+        ).fetchone() is not None
+
+        # In-memory view of Decision/Lesson rows (see _refresh_constraints)
+        self._constraints_view_state = None
+        self._constraint_rows = []
+        self._prohibited = ''
+
+        # Audit rows are queued and written in batches by a background thread
+        self._audit_queue = queue.SimpleQueue()
+        self._audit_thread = threading.Thread(
+            target=self._audit_worker, name='governor-audit', daemon=True
+        )
+        self._audit_thread.start()
+        self._closed = False
+        self._batch_audit = None  # audit rows held back while check_actions runs
+        atexit.register(self.close)
+
+    def close(self):
+        """Write any queued audit rows, stop the audit thread, and close the connection"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._audit_queue.put(None)
+        self._audit_thread.join(AUDIT_FLUSH_TIMEOUT)
+        if not self._audit_thread.is_alive():
+            self._write_queued_audit()  # rows the worker never reached, if it died
+        self._conn.close()
+
+    def flush(self):
+        """
+        Block until every audit row queued so far is committed.
+
+        If the audit thread has died, the queued rows are written on this
+        thread instead. Raises RuntimeError if a live audit thread has not
+        caught up within AUDIT_FLUSH_TIMEOUT seconds. No-op after close().
+        """
+        if self._closed:
+            return
+        if not self._audit_thread.is_alive():
+            self._write_queued_audit()
+            return
+        done = threading.Event()
+        self._audit_queue.put(done)
+        deadline = time.monotonic() + AUDIT_FLUSH_TIMEOUT
+        while not done.wait(0.1):
+            if not self._audit_thread.is_alive():
+                self._write_queued_audit()
+                return
+            if time.monotonic() >= deadline:
+                raise RuntimeError(
+                    f"governor: audit log flush timed out after {AUDIT_FLUSH_TIMEOUT:g}s"
+                )
+
+    def _write_queued_audit(self):
+        """Insert whatever is left on the audit queue using the main connection"""
+        rows = []
+        while True:
+            try:
+                item = self._audit_queue.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is not None:
+                rows.append(item)
+        if rows:
+            self._conn.executemany(_SQL_INSERT_AUDIT, rows)
+
+    def _audit_worker(self):
+        """Drain the audit queue, writing up to AUDIT_BATCH_SIZE rows per commit"""
+        conn = sqlite3.connect(self.db_path, cached_statements=16)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        q = self._audit_queue
+        running = True
+        while running:
+            batch, waiters = [], []
+            item = q.get()
+            while True:
+                if item is None:
+                    running = False
+                    break
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                else:
+                    batch.append(item)
+                if len(batch) >= AUDIT_BATCH_SIZE:
+                    break
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write_audit_batch(conn, batch)
+            for done in waiters:
+                done.set()
+        conn.close()
+
+    @staticmethod
+    def _write_audit_batch(conn, batch):
+        """Insert one audit batch, retrying with backoff; report rows that never land"""
+        for attempt in range(1, AUDIT_WRITE_ATTEMPTS + 1):
+            try:
+                conn.executemany(_SQL_INSERT_AUDIT, batch)
+                conn.commit()
+                return
+            except sqlite3.Error as e:
+                conn.rollback()
+                error = e
+                if attempt < AUDIT_WRITE_ATTEMPTS:
+                    time.sleep(0.1 * 2 ** attempt)
+        print(f"governor: failed to write {len(batch)} audit rows: {error}", file=sys.stderr)
+        for row in batch:
+            print(f"governor: unwritten audit row: {_dumps(row)}", file=sys.stderr)
+
+    def _extract_action_keywords(self, action_data: Dict[str, Any]) -> Tuple[List[str], Optional[str]]:
+        """
+        Extract searchable keywords from an action for constraint matching.
 
-    def _extract_action_keywords(self, action_data: Dict[str, Any]) -> List[str]:
-        """Extract searchable keywords from an action for constraint matching."""
+        Returns:
+            (keywords, lowered) where lowered is the lowercased content/cmd that
+            _check_constraint_violation scans, or None for other actions
+        """
         keywords = []
+        lowered = None
         action = action_data.get('action', '')
 
         # Extract from content/text fields
         if action == 'edit_file':
-            content = action_data.get('content', '')
+            lowered = action_data.get('content', '').lower()
             path = action_data.get('path', '')
             # Extract technology mentions from content
-            tech_patterns = [
-                r'\b(jquery|react|vue|angular|preact|svelte)\b',
-                r'\b(python|javascript|typescript|rust|go|java)\b',
-                r'\b(postgres|mysql|sqlite|mongodb|redis)\b',
-                r'\b(aws|gcp|azure|docker|kubernetes)\b',
-            ]
-            for pattern in tech_patterns:
-                matches = re.findall(pattern, content.lower())
-                keywords.extend(matches)
+            keywords.extend(_TECH_RE.findall(lowered))
             # Also check the file path
             if path:
-                keywords.append(path.split('/')[-1])  # filename
+                keywords.append(path.rpartition('/')[2])  # filename
 
         elif action == 'exec':
             cmd = action_data.get('cmd', '')
+            lowered = cmd.lower()
             # Extract command name and key arguments
-            parts = cmd.split()
+            # Only the first five words are used; leave the rest of long command lines unsplit
+            parts = cmd.split(maxsplit=5)
             if parts:
                 keywords.append(parts[0])  # command name
                 # Look for package names, etc.
@@ -125,63 +539,90 @@ class Governor:
         elif action == 'http_request':
             url = action_data.get('url', '')
             # Extract domain
-            import re as re_mod
-            domain_match = re_mod.search(r'https?://([^/]+)', url)
-            if domain_match:
-                keywords.append(domain_match.group(1))
+            host = _url_host(url)
+            if host:
+                keywords.append(host)
 
-        return [k.lower() for k in keywords if k and len(k) > 2]
+        return [k.lower() for k in keywords if k and len(k) > 2], lowered
+
+    def _constraints_state(self) -> Tuple[Any, ...]:
+        """Changes whenever Decision/Lesson rows are written here or by another process"""
+        if self._has_generation:
+            try:
+                row = self._conn.execute(_SQL_CONSTRAINT_GENERATION).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                return (self._constraints_version, 'generation', row[0])
+        return (self._constraints_version, 'data_version',
+                self._conn.execute("PRAGMA data_version").fetchone()[0])
+
+    def _refresh_constraints(self):
+        """
+        Rebuild the in-memory view of Decision/Lesson rows when they change.
+
+        _constraint_rows holds (constraint, haystack) pairs, newest first,
+        where haystack is the row's lowercased text and topic.
+        _prohibited holds the haystacks of rows that use prohibition
+        language, joined by newlines.
+        """
+        state = self._constraints_state()
+        if state == self._constraints_view_state:
+            return
+        rows = []
+        prohibited = []
+        try:
+            for r in self._conn.execute(_SQL_SELECT_CONSTRAINT_ROWS):
+                constraint = {
+                    'id': r[0],
+                    'type': r[1],
+                    'topic': r[2],
+                    'text': r[3],
+                    'choice': r[4],
+                    'importance': r[5]
+                }
+                haystack = f"{r[3] or ''}\n{r[2] or ''}".lower()
+                rows.append((constraint, haystack))
+                if r[3] and _PROHIBITION_RE.search(r[3]):
+                    prohibited.append(haystack)
+        except sqlite3.Error:
+            # No usable constraint source (e.g. no chunks table): enforce nothing
+            # rather than crash the gate, as the per-check search used to
+            rows, prohibited = [], []
+        self._constraint_rows = rows
+        self._prohibited = "\n".join(prohibited)
+        self._constraints_view_state = state
+
+    def _prohibited_text(self) -> str:
+        """Lowercased text and topics of every Decision/Lesson that uses prohibition language"""
+        self._refresh_constraints()
+        return self._prohibited
 
     def _search_memory_constraints(self, keywords: List[str]) -> List[Dict[str, Any]]:
         """Search memory for Decision/Lesson entries that might conflict."""
         if not keywords:
             return []
 
+        self._refresh_constraints()
         constraints = []
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        seen_ids = set()
 
-        # Search for decisions and lessons containing any of the keywords
+        # The 5 newest Decision/Lesson rows mentioning each keyword in their
+        # text or topic, deduplicated by ID
         for keyword in keywords[:10]:  # Limit to first 10 keywords
-            try:
-                cursor.execute("""
-                    SELECT id, anchor_type, anchor_topic, text, anchor_choice, importance
-                    FROM chunks
-                    WHERE anchor_type IN ('d', 'D', 'L')
-                      AND (text LIKE ? OR anchor_topic LIKE ?)
-                    ORDER BY timestamp DESC
-                    LIMIT 5
-                """, (f'%{keyword}%', f'%{keyword}%'))
-
-                for row in cursor.fetchall():
-                    constraints.append({
-                        'id': row[0],
-                        'type': row[1],
-                        'topic': row[2],
-                        'text': row[3],
-                        'choice': row[4],
-                        'importance': row[5],
-                        'matched_keyword': keyword
-                    })
-            except sqlite3.Error:
-                continue
+            matches = (c for c, haystack in self._constraint_rows if keyword in haystack)
+            for c in islice(matches, 5):
+                if c['id'] not in seen_ids:
+                    seen_ids.add(c['id'])
+                    constraints.append({**c, 'matched_keyword': keyword})
 
-        conn.close()
-
-        # Deduplicate by ID
-        seen_ids = set()
-        unique_constraints = []
-        for c in constraints:
-            if c['id'] not in seen_ids:
-                seen_ids.add(c['id'])
-                unique_constraints.append(c)
-
-        return unique_constraints
+        return constraints
 
     def _check_constraint_violation(
         self,
         action_data: Dict[str, Any],
-        constraints: List[Dict[str, Any]]
+        constraints: List[Dict[str, Any]],
+        lowered: Optional[str] = None
     ) -> Optional[Tuple[Dict[str, Any], str]]:
         """
         Check if action violates any memory constraints.
@@ -192,42 +633,29 @@ class Governor:
         if not constraints:
             return None
 
-        action = action_data.get('action', '')
-
-        # Negative keywords that indicate a prohibition
-        prohibition_patterns = [
-            r'\b(ban|banned|prohibit|forbidden|never|avoid|don\'t|do not|must not)\b',
-            r'\b(deprecated|removed|replaced|migrated away from)\b',
-            r'\b(security risk|vulnerability|unsafe|insecure)\b',
-        ]
+        # Only edit_file content and exec commands can use a prohibited thing;
+        # lower the scanned string once rather than per constraint
+        if lowered is None:
+            action = action_data.get('action', '')
+            if action == 'edit_file':
+                lowered = action_data.get('content', '').lower()
+            elif action == 'exec':
+                lowered = action_data.get('cmd', '').lower()
+            else:
+                return None
 
         for constraint in constraints:
             text = (constraint.get('text') or '').lower()
-            choice = (constraint.get('choice') or '').lower()
 
             # Check if constraint contains prohibition language
-            is_prohibition = any(
-                re.search(pattern, text, re.IGNORECASE)
-                for pattern in prohibition_patterns
-            )
-
-            if is_prohibition:
+            if _PROHIBITION_RE.search(text) is not None:
                 keyword = constraint.get('matched_keyword', '')
                 # Check if the action is trying to use the prohibited thing
-                if action == 'edit_file':
-                    content = action_data.get('content', '').lower()
-                    if keyword in content:
-                        return (
-                            constraint,
-                            f"Memory constraint #{constraint['id']} prohibits '{keyword}': {text[:100]}..."
-                        )
-                elif action == 'exec':
-                    cmd = action_data.get('cmd', '').lower()
-                    if keyword in cmd:
-                        return (
-                            constraint,
-                            f"Memory constraint #{constraint['id']} prohibits '{keyword}': {text[:100]}..."
-                        )
+                if keyword in lowered:
+                    return (
+                        constraint,
+                        f"Memory constraint #{constraint['id']} prohibits '{keyword}': {text[:100]}..."
+                    )
 
         return None
 
@@ -243,20 +671,26 @@ class Governor:
 
         # Only check certain action types
         action = action_data.get('action', '')
-        if action not in ('edit_file', 'exec', 'http_request'):
+        if action not in CONSTRAINT_ACTIONS:
             return {'violation': False, 'constraint': None, 'reason': 'Action type not subject to constraint check'}
 
         # Extract keywords and search for constraints
-        keywords = self._extract_action_keywords(action_data)
+        keywords, lowered = self._extract_action_keywords(action_data)
         if not keywords:
             return {'violation': False, 'constraint': None, 'reason': 'No searchable keywords found'}
 
+        # Only prohibition rows can be violated; skip the search when no
+        # keyword occurs in any of them
+        prohibited = self._prohibited_text()
+        if not any(k in prohibited for k in keywords[:10]):
+            return {'violation': False, 'constraint': None, 'reason': 'No relevant constraints found'}
+
         constraints = self._search_memory_constraints(keywords)
         if not constraints:
             return {'violation': False, 'constraint': None, 'reason': 'No relevant constraints found'}
 
         # Check for violations
-        violation = self._check_constraint_violation(action_data, constraints)
+        violation = self._check_constraint_violation(action_data, constraints, lowered)
         if violation:
             constraint, reason = violation
             return {'violation': True, 'constraint': constraint, 'reason': reason}
@@ -268,28 +702,55 @@ class Governor:
             'checked_constraints': len(constraints)
         }
 
+    def _cached_constraint_check(self, action_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        check_memory_constraints, memoized on the fields it reads.
+        Entries are keyed by _constraints_state() as well, so any Decision/Lesson
+        added, edited or removed (by any process) misses the cache.
+        """
+        fields = _dumps([action_data.get(f) for f in CONSTRAINT_FIELDS])
+        key = (
+            hashlib.blake2b(fields.encode('utf-8'), digest_size=16).digest(),
+            self._constraints_state()
+        )
+        cache = self._constraint_cache
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+            return result
+        result = self.check_memory_constraints(action_data)
+        cache[key] = result
+        if len(cache) > CONSTRAINT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return result
+
     def check_action(self, action_data):
         """
         Check if action is allowed.
         Returns: {'decision': 'ALLOW'|'ESCALATE'|'DENY', 'reason': str, 'pending_id': int|None, 'constraint_id': int|None}
         """
-        action = action_data.get('action', '').lower()
+        action = action_data.get('action', '')
+        if action not in ACTION_RULES:
+            action = action.lower()  # rule names are lowercase; only fold the rest
+        # Serialized once; shared by the audit row and any pending row
+        data_json = _dumps(action_data)
 
         # Check DENY list first (always, even in unrestricted mode)
-        for deny_action, reason in DENY_ACTIONS.items():
-            if deny_action in action.lower():
-                self._log_audit(action, action_data, 'DENY', reason)
-                return {'decision': 'DENY', 'reason': reason, 'constraint_id': None}
+        deny_match = _DENY_RE.search(action)
+        if deny_match:
+            reason = _DENY_REASONS[deny_match.group(0).lower()]
+            self._log_audit(action, data_json, 'DENY', reason)
+            return {'decision': 'DENY', 'reason': reason, 'constraint_id': None}
 
         # Check memory constraints BEFORE unrestricted bypass
         # Memory constraints are enforced even in unrestricted mode
         # to ensure core architectural decisions are respected
-        if self.enforce_memory and action in ('edit_file', 'exec', 'http_request'):
-            constraint_result = self.check_memory_constraints(action_data)
+        if self.enforce_memory and action in CONSTRAINT_ACTIONS:
+            constraint_result = self._cached_constraint_check(action_data)
             if constraint_result.get('violation'):
                 constraint = constraint_result.get('constraint', {})
                 reason = f"MEMORY CONSTRAINT VIOLATION: {constraint_result.get('reason', 'Unknown')}"
-                self._log_audit(action, action_data, 'DENY', reason)
+                self._log_audit(action, data_json, 'DENY', reason)
                 return {
                     'decision': 'DENY',
                     'reason': reason,
@@ -299,209 +760,138 @@ class Governor:
 
         # Unrestricted mode: allow but log (after constraint check)
         if self.unrestricted:
-            self._log_audit(action, action_data, 'ALLOW', 'Unrestricted mode')
+            self._log_audit(action, data_json, 'ALLOW', 'Unrestricted mode')
             return {'decision': 'ALLOW', 'reason': 'Unrestricted mode', 'constraint_id': None}
 
-        # Check ESCALATE conditions
-        if action == 'write_memory':
-            entry_type = action_data.get('type', 'n')
-            if entry_type in ESCALATE_ACTIONS.get('write_memory', {}).get('types', []):
-                reason = f"Decision writes (type={entry_type}) require human review"
-                pending_id = self._queue_for_review(action, action_data, reason)
-                self._log_audit(action, action_data, 'ESCALATE', reason)
-                return {'decision': 'ESCALATE', 'reason': reason, 'pending_id': pending_id}
-
-        if action in ESCALATE_ACTIONS and action != 'write_memory':
-            reason = ESCALATE_ACTIONS[action].get('description', 'Requires review')
-            pending_id = self._queue_for_review(action, action_data, reason)
-            self._log_audit(action, action_data, 'ESCALATE', reason)
+        # Classify by the action's precompiled rule (see compile_action_rules)
+        rule = ACTION_RULES.get(action)
+        if rule is None:
+            decision, reason = 'ESCALATE', f"Unknown action '{action}' requires review"
+        else:
+            decision, reason = rule(action_data)
+
+        if decision == 'ESCALATE':
+            pending_id = self._queue_for_review(action, data_json, reason)
+            self._log_audit(action, data_json, 'ESCALATE', reason)
             return {'decision': 'ESCALATE', 'reason': reason, 'pending_id': pending_id}
 
-        # Check ALLOW conditions
-        if action in ALLOW_ACTIONS:
-            allow_config = ALLOW_ACTIONS[action]
-            if 'types' in allow_config:
-                entry_type = action_data.get('type', '')
-                if entry_type in allow_config['types']:
-                    reason = allow_config.get('description', 'Allowed')
-                    self._log_audit(action, action_data, 'ALLOW', reason)
-                    return {'decision': 'ALLOW', 'reason': reason}
-            else:
-                reason = allow_config.get('description', 'Allowed')
-                self._log_audit(action, action_data, 'ALLOW', reason)
-                return {'decision': 'ALLOW', 'reason': reason}
-
-        # Default: escalate unknown actions
-        reason = f"Unknown action '{action}' requires review"
-        pending_id = self._queue_for_review(action, action_data, reason)
-        self._log_audit(action, action_data, 'ESCALATE', reason)
-        return {'decision': 'ESCALATE', 'reason': reason, 'pending_id': pending_id}
-
-    def _queue_for_review(self, action, action_data, reason):
-        """Queue action for human review"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
-            from datetime import UTC
-            now = datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%SZ')
-        except ImportError:
-            now = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-
-        cursor.execute("""
-            INSERT INTO pending_changes (action_type, action_data, proposed_by, proposed_at, status)
-            VALUES (?, ?, ?, ?, 'pending')
-        """, (action, json.dumps(action_data), self.actor, now))
-        pending_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return pending_id
+        self._log_audit(action, data_json, 'ALLOW', reason)
+        return {'decision': 'ALLOW', 'reason': reason}
 
-    def _log_audit(self, action, action_data, decision, reason):
-        """Log decision to audit_log"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def check_actions(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Check a batch of actions in a single transaction.
+        Returns one check_action result per action, in order.
+        """
+        self._conn.execute("BEGIN")
+        self._batch_audit = batch_audit = []
         try:
-            from datetime import UTC
-            now = datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%SZ')
-        except ImportError:
-            now = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-
-        cursor.execute("""
-            INSERT INTO audit_log (timestamp, action_type, action_data, decision, reason, actor)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (now, action, json.dumps(action_data), decision, reason, self.actor))
-        conn.commit()
-        conn.close()
-
-    def get_pending(self):
-        """Get all pending changes"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, action_type, action_data, proposed_by, proposed_at
-            FROM pending_changes
-            WHERE status = 'pending'
-            ORDER BY proposed_at ASC
-        """)
-        rows = cursor.fetchall()
-        conn.close()
-        return [
-            {
-                'id': r[0],
-                'action_type': r[1],
-                'action_data': json.loads(r[2]),
-                'proposed_by': r[3],
-                'proposed_at': r[4]
-            }
-            for r in rows
-        ]
+            results = [self.check_action(action_data) for action_data in actions]
+            self._conn.execute("COMMIT")
+        except BaseException:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+        finally:
+            self._batch_audit = None
+        # Audit rows are queued only once the decisions (and pending rows) they
+        # record are committed; the audit thread also needs the write lock the
+        # batch held, so durable decisions are flushed only now
+        self._enqueue_audit(
+            batch_audit, any(row[3] in AUDIT_SYNC_DECISIONS for row in batch_audit)
+        )
+        return results
+
+    def _queue_for_review(self, action, data_json, reason):
+        """Queue action (with its JSON-serialized action_data) for human review"""
+        now = _now_iso()
+
+        cursor = self._conn.execute(_SQL_INSERT_PENDING, (action, data_json, self.actor, now))
+        return cursor.lastrowid
+
+    def _log_audit(self, action, data_json, decision, reason):
+        """Queue decision (with JSON-serialized action_data) for audit_log"""
+        row = (_now_iso(), action, data_json, decision, reason, self.actor)
+        if self._batch_audit is not None:
+            self._batch_audit.append(row)  # queued by check_actions after COMMIT
+        else:
+            self._enqueue_audit((row,), decision in AUDIT_SYNC_DECISIONS)
+
+    def _enqueue_audit(self, rows, sync):
+        """Hand audit rows to the audit thread; with sync, wait until they are committed"""
+        for row in rows:
+            self._audit_queue.put(row)
+        if not self._audit_thread.is_alive():
+            self._write_queued_audit()  # no worker left to batch them
+        elif sync:
+            self.flush()
+
+    def get_pending(self, parsed=False) -> List[Any]:
+        """
+        Get all pending changes as sqlite3.Row objects (id, action_type,
+        action_data, proposed_by, proposed_at), action_data being the stored
+        JSON string. parsed=True returns dicts with action_data decoded.
+        """
+        rows = self._conn.execute(_SQL_SELECT_PENDING).fetchall()
+        if not parsed:
+            return rows
+        return [{**dict(r), 'action_data': _loads(r['action_data'])} for r in rows]
 
     def approve(self, pending_id, reviewer='human', notes=''):
         """Approve a pending change"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
-            from datetime import UTC
-            now = datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%SZ')
-        except ImportError:
-            now = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-
-        cursor.execute("""
-            UPDATE pending_changes
-            SET status = 'approved', reviewed_by = ?, reviewed_at = ?, review_notes = ?
-            WHERE id = ? AND status = 'pending'
-        """, (reviewer, now, notes, pending_id))
-
-        # Get the action data for execution
-        cursor.execute("SELECT action_type, action_data, status FROM pending_changes WHERE id = ?", (pending_id,))
-        row = cursor.fetchone()
-        conn.commit()
-        conn.close()
+        now = _now_iso()
+        params = (reviewer, now, notes, pending_id)
 
-        if row and row[2] == 'approved':
-            self._log_audit(row[0], json.loads(row[1]), 'APPROVED', f"Approved by {reviewer}: {notes}")
-            return {'action_type': row[0], 'action_data': json.loads(row[1])}
+        if _HAS_RETURNING:
+            # Update and read back the action data in one statement
+            row = self._conn.execute(_SQL_APPROVE_RETURNING, params).fetchone()
+        else:
+            cursor = self._conn.execute(_SQL_APPROVE, params)
+            row = None
+            if cursor.rowcount:
+                row = self._conn.execute(
+                    "SELECT action_type, action_data FROM pending_changes WHERE id = ?", (pending_id,)
+                ).fetchone()
+
+        if row:
+            if row[0] == 'write_memory':
+                # An approved decision may become a new constraint
+                self._constraints_version += 1
+            self._log_audit(row[0], row[1], 'APPROVED', f"Approved by {reviewer}: {notes}")
+            return {'action_type': row[0], 'action_data': _loads(row[1])}
         return None
 
     def reject(self, pending_id, reviewer='human', notes=''):
         """Reject a pending change"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        try:
-            from datetime import UTC
-            now = datetime.now(UTC).strftime('%Y-%m-%dT%H:%M:%SZ')
-        except ImportError:
-            now = datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
-
-        cursor.execute("""
-            UPDATE pending_changes
-            SET status = 'rejected', reviewed_by = ?, reviewed_at = ?, review_notes = ?
-            WHERE id = ? AND status = 'pending'
-        """, (reviewer, now, notes, pending_id))
-        conn.commit()
-        conn.close()
-        self._log_audit('reject', {'pending_id': pending_id}, 'REJECTED', f"Rejected by {reviewer}: {notes}")
-
-    def get_audit_log(self, limit=20):
-        """Get recent audit log entries"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT timestamp, action_type, decision, reason, actor
-            FROM audit_log
-            ORDER BY timestamp DESC
-            LIMIT ?
-        """, (limit,))
-        rows = cursor.fetchall()
-        conn.close()
-        return [
-            {
-                'timestamp': r[0],
-                'action_type': r[1],
-                'decision': r[2],
-                'reason': r[3],
-                'actor': r[4]
-            }
-            for r in rows
-        ]
+        now = _now_iso()
+
+        self._conn.execute(_SQL_REJECT, (reviewer, now, notes, pending_id))
+        self._log_audit('reject', _dumps({'pending_id': pending_id}), 'REJECTED', f"Rejected by {reviewer}: {notes}")
+
+    def get_audit_log(self, limit=20) -> Iterator[sqlite3.Row]:
+        """
+        Yield recent audit log entries, newest first, as sqlite3.Row objects
+        (timestamp, action_type, decision, reason, actor).
+        """
+        self.flush()
+        yield from self._conn.execute(_SQL_SELECT_AUDIT, (limit,))
 
     def get_constraints(self, limit=20) -> List[Dict[str, Any]]:
         """Get active memory constraints (Decision and Lesson entries)."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT id, anchor_type, anchor_topic, text, anchor_choice, importance, timestamp
-            FROM chunks
-            WHERE anchor_type IN ('d', 'D', 'L')
-            ORDER BY
-                CASE importance
-                    WHEN 'H' THEN 1
-                    WHEN 'M' THEN 2
-                    WHEN 'L' THEN 3
-                    ELSE 4
-                END,
-                timestamp DESC
-            LIMIT ?
-        """, (limit,))
-        rows = cursor.fetchall()
-        conn.close()
-
-        type_labels = {
-            'd': 'Decision', 'D': 'Decision',
-            'L': 'Lesson'
-        }
+        cursor = self._conn.execute(_SQL_SELECT_CONSTRAINTS, (limit,))
 
+        # Dicts are built straight from the cursor; no intermediate row list
         return [
             {
                 'id': r[0],
-                'type': type_labels.get(r[1], r[1]),
+                'type': CONSTRAINT_TYPE_LABELS.get(r[1], r[1]),
                 'topic': r[2],
                 'text': r[3],
                 'choice': r[4],
                 'importance': r[5] or 'M',
                 'timestamp': r[6]
             }
-            for r in rows
+            for r in cursor
         ]
 
 
@@ -552,7 +942,7 @@ def main():
             print(f"Pending changes ({len(pending)}):\n")
             for p in pending:
                 print(f"  [{p['id']}] {p['action_type']}")
-                print(f"      Data: {json.dumps(p['action_data'])[:80]}...")
+                print(f"      Data: {p['action_data'][:80]}...")
                 print(f"      Proposed: {p['proposed_at']} by {p['proposed_by']}")
                 print()
 
@@ -570,22 +960,24 @@ def main():
         print(f"Rejected pending change {args.id}")
 
     elif args.command == 'audit':
-        entries = gov.get_audit_log(args.limit)
-        if not entries:
+        decision_colors = {
+            'ALLOW': '\033[32m',      # green
+            'ESCALATE': '\033[33m',   # yellow
+            'DENY': '\033[31m',       # red
+            'APPROVED': '\033[32m',
+            'REJECTED': '\033[31m'
+        }
+        shown = 0
+        for e in gov.get_audit_log(args.limit):
+            if not shown:
+                print(f"Audit log (up to {args.limit} entries, newest first):\n")
+            shown += 1
+            decision_color = decision_colors.get(e['decision'], '')
+            print(f"  {e['timestamp'][:19]} {decision_color}[{e['decision']}]\033[0m {e['action_type']}")
+            print(f"      {e['reason']}")
+            print()
+        if not shown:
             print("No audit log entries.")
-        else:
-            print(f"Audit log (last {len(entries)} entries):\n")
-            for e in entries:
-                decision_color = {
-                    'ALLOW': '\033[32m',      # green
-                    'ESCALATE': '\033[33m',   # yellow
-                    'DENY': '\033[31m',       # red
-                    'APPROVED': '\033[32m',
-                    'REJECTED': '\033[31m'
-                }.get(e['decision'], '')
-                print(f"  {e['timestamp'][:19]} {decision_color}[{e['decision']}]\033[0m {e['action_type']}")
-                print(f"      {e['reason']}")
-                print()
 
     elif args.command == 'constraints':
         constraints = gov.get_constraints(args.limit)
@@ -609,6 +1001,8 @@ def main():
     else:
         parser.print_help()
 
+    gov.close()
+
 
 if __name__ == '__main__':
     main()
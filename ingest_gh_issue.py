@@ -81,12 +81,20 @@ def extract_bounty_amount(labels: list) -> str:
 def create_todo(task_id: str, topic: str, text: str, importance: str = "M",
                 source: str = "gh-ingest", links: dict = None):
     """Create a TODO in the memory database"""
-    conn = sqlite3.connect(DB_PATH)
+    # Autocommit connection; the upsert below runs in one explicit transaction
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
     cursor = conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")  # WAL commits append without a journal fsync pair
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
 
     ts = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
     links_json = json.dumps(links) if links else json.dumps({"id": task_id})
 
+    # Take the write lock before the existence check so check-then-write is atomic
+    cursor.execute("BEGIN IMMEDIATE")
+
     # Check if TODO already exists
     cursor.execute("""
         SELECT id FROM chunks
@@ -109,7 +117,7 @@ def create_todo(task_id: str, topic: str, text: str, importance: str = "M",
             )
         """, (ts, text, topic, source, task_id, links_json, importance))
 
-    conn.commit()
+    cursor.execute("COMMIT")
     conn.close()
     print(f"Created TODO: {task_id}")
 
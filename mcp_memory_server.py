@@ -71,6 +71,16 @@ def get_db() -> sqlite3.Connection:
     return sqlite3.connect(str(DB_PATH))
 
 
+# (exclusive upper bound in seconds, divisor, unit) for format_relative_time;
+# anything older than 30 days falls back to the date
+RELATIVE_TIME_BUCKETS = (
+    (60, 1, "s"),
+    (3600, 60, "m"),
+    (86400, 3600, "h"),
+    (2592000, 86400, "d"),
+)
+
+
 def format_relative_time(ts_str: str) -> tuple[str, bool]:
     """Convert ISO timestamp to relative time + freshness flag."""
     if not ts_str:
@@ -83,21 +93,15 @@ def format_relative_time(ts_str: str) -> tuple[str, bool]:
     if ts.tzinfo is None:
         ts = ts.replace(tzinfo=timezone.utc)
     now = datetime.now(timezone.utc)
-    delta = now - ts
-    total_seconds = delta.total_seconds()
+    total_seconds = (now - ts).total_seconds()
     if total_seconds < 0:
         return (ts_str[:10], False)
-    is_fresh = total_seconds < 3600  # < 1 hour
-    if total_seconds < 60:
-        return (f"{int(total_seconds)}s ago", is_fresh)
-    elif total_seconds < 3600:
-        return (f"{int(total_seconds / 60)}m ago", is_fresh)
-    elif total_seconds < 86400:
-        return (f"{int(total_seconds / 3600)}h ago", is_fresh)
-    elif total_seconds < 2592000:
-        return (f"{int(total_seconds / 86400)}d ago", is_fresh)
-    else:
-        return (ts_str[:10], False)
+    seconds = int(total_seconds)
+    is_fresh = seconds < 3600  # < 1 hour
+    for upper, scale, unit in RELATIVE_TIME_BUCKETS:
+        if seconds < upper:
+            return (f"{seconds // scale}{unit} ago", is_fresh)
+    return (ts_str[:10], False)
 
 
 # =============================================================================
@@ -182,6 +182,32 @@ CREATE TABLE IF NOT EXISTS audit_log (
 )
 """)
 
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_lessons ON chunks(anchor_type, anchor_topic, timestamp) WHERE anchor_type = 'L'")
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_pending_status_time ON pending_changes(status, proposed_at) WHERE status = 'pending'")
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_time ON audit_log(timestamp)")
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_constraints ON chunks(anchor_type, timestamp DESC) WHERE anchor_type IN ('d', 'D', 'L')")
+
+# Generation counter bumped by triggers on any Decision/Lesson insert, update or
+# delete; governor keys its cached constraint view and checks on it
+cursor.execute("""
+CREATE TABLE IF NOT EXISTS constraint_generation (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL
+)
+""")
+cursor.execute("INSERT OR IGNORE INTO constraint_generation (id, generation) VALUES (1, 0)")
+for name, event, condition in (
+    ("chunks_constraints_ai", "INSERT", "new.anchor_type IN ('d', 'D', 'L')"),
+    ("chunks_constraints_ad", "DELETE", "old.anchor_type IN ('d', 'D', 'L')"),
+    ("chunks_constraints_au", "UPDATE", "old.anchor_type IN ('d', 'D', 'L') OR new.anchor_type IN ('d', 'D', 'L')"),
+):
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON chunks WHEN {condition}
+    BEGIN
+        UPDATE constraint_generation SET generation = generation + 1 WHERE id = 1;
+    END
+    """)
+
 conn.commit()
 conn.close()
 PYEOF
@@ -290,6 +316,35 @@ CREATE TABLE IF NOT EXISTS audit_log (
 """)
 print("Created audit_log table (if not exists)")
 
+# Lesson lookups (dream_consolidator) and governor pending/audit listings
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_lessons ON chunks(anchor_type, anchor_topic, timestamp) WHERE anchor_type = 'L'")
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_pending_status_time ON pending_changes(status, proposed_at) WHERE status = 'pending'")
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_time ON audit_log(timestamp)")
+cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_constraints ON chunks(anchor_type, timestamp DESC) WHERE anchor_type IN ('d', 'D', 'L')")
+print("Created indexes: idx_chunks_lessons, idx_pending_status_time, idx_audit_time, idx_chunks_constraints (if not exist)")
+
+# Generation counter bumped by triggers on any Decision/Lesson insert, update or
+# delete; governor keys its cached constraint view and checks on it
+cursor.execute("""
+CREATE TABLE IF NOT EXISTS constraint_generation (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    generation INTEGER NOT NULL
+)
+""")
+cursor.execute("INSERT OR IGNORE INTO constraint_generation (id, generation) VALUES (1, 0)")
+for name, event, condition in (
+    ("chunks_constraints_ai", "INSERT", "new.anchor_type IN ('d', 'D', 'L')"),
+    ("chunks_constraints_ad", "DELETE", "old.anchor_type IN ('d', 'D', 'L')"),
+    ("chunks_constraints_au", "UPDATE", "old.anchor_type IN ('d', 'D', 'L') OR new.anchor_type IN ('d', 'D', 'L')"),
+):
+    cursor.execute(f"""
+    CREATE TRIGGER IF NOT EXISTS {name} AFTER {event} ON chunks WHEN {condition}
+    BEGIN
+        UPDATE constraint_generation SET generation = generation + 1 WHERE id = 1;
+    END
+    """)
+print("Created constraint_generation counter and triggers (if not exist)")
+
 if added_columns:
     print(f"Created indexes: idx_scope, idx_chat_id, idx_visibility, idx_due")
 else:
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+profile_tech_patterns.py - Order governor's technology terms by match frequency
+
+Scans historical edit_file actions in audit_log with governor's technology
+regex and writes governor_patterns.json, listing TECH_TERMS most frequently
+matched first. governor.py loads the file at import (see load_tech_terms) so
+the alternation tries common terms first. Every term is kept, so enforcement
+is unchanged; terms that never matched are listed last.
+
+Usage:
+    python profile_tech_patterns.py                  # Profile memory.db
+    python profile_tech_patterns.py --db other.db    # Profile another database
+    python profile_tech_patterns.py --dry-run        # Print counts, write nothing
+"""
+import argparse
+import json
+import sqlite3
+from collections import Counter
+
+from governor import SCRIPT_DIR, TECH_PATTERNS_FILE, TECH_TERMS, _loads, compile_tech_re
+
+_SQL_EDIT_ACTIONS = """
+    SELECT action_data FROM audit_log WHERE action_type = 'edit_file'
+"""
+
+
+def profile(db_path: str):
+    """Return (matches per term, number of edit_file actions scanned)"""
+    tech_re = compile_tech_re(TECH_TERMS)
+    counts = Counter()
+    scanned = 0
+
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(_SQL_EDIT_ACTIONS)
+        cursor.arraysize = 1000
+        while True:
+            batch = cursor.fetchmany()
+            if not batch:
+                break
+            for (action_data,) in batch:
+                try:
+                    content = _loads(action_data).get('content') or ''
+                except (ValueError, TypeError, AttributeError):
+                    continue
+                scanned += 1
+                counts.update(tech_re.findall(content.lower()))
+    finally:
+        conn.close()
+
+    return counts, scanned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile governor technology terms by match frequency")
+    parser.add_argument('--db', default=str(SCRIPT_DIR / 'memory.db'), help='Database path')
+    parser.add_argument('--output', '-o', default=str(TECH_PATTERNS_FILE), help='Output file')
+    parser.add_argument('--dry-run', action='store_true', help='Print counts without writing')
+    args = parser.parse_args()
+
+    counts, scanned = profile(args.db)
+    # Stable sort: ties (including never-matched terms) keep TECH_TERMS order
+    terms = sorted(TECH_TERMS, key=lambda t: -counts[t])
+
+    print(f"Scanned {scanned} edit_file actions")
+    for term in terms:
+        print(f"  {term:12} {counts[term]:6}")
+
+    if args.dry_run:
+        return
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'scanned': scanned,
+            'terms': terms,
+            'counts': {t: counts[t] for t in terms}
+        }, f, indent=2)
+        f.write("\n")
+    print(f"\nWrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for governor memory-constraint enforcement.
+Verifies that a long-lived Governor sees Decision/Lesson edits made after it
+cached its constraint view and constraint checks.
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent dir to path to import governor
+SCRIPT_DIR = Path(__file__).parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+from governor import Governor
+
+REDIS_ACTION = {"action": "exec", "cmd": "redis flushall"}
+
+
+def make_db(path: Path, migrated: bool) -> Path:
+    """Create a memory database via mem-db.sh, optionally without the generation counter"""
+    env = dict(os.environ, MEMORY_DB=str(path))
+    for command in ("init", "migrate"):
+        subprocess.run([str(SCRIPT_DIR / "mem-db.sh"), command], env=env, check=True, capture_output=True)
+    if not migrated:
+        conn = sqlite3.connect(path)
+        for trigger in ("chunks_constraints_ai", "chunks_constraints_ad", "chunks_constraints_au"):
+            conn.execute(f"DROP TRIGGER {trigger}")
+        conn.execute("DROP TABLE constraint_generation")
+        conn.commit()
+        conn.close()
+    return path
+
+
+@pytest.mark.parametrize(
+    "migrated,generation",
+    [(True, True), (False, True), (False, False)],
+    ids=["generation", "governor_generation", "data_version"],
+)
+def test_decision_edit_changes_next_verdict(tmp_path, migrated, generation):
+    """Editing a Decision's text in place must reach an already-running Governor"""
+    db = make_db(tmp_path / "memory.db", migrated)
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "INSERT INTO chunks (anchor_type, anchor_topic, text, timestamp) "
+        "VALUES ('D', 'cache', 'We use redis for caching', '2025-01-01T00:00:00Z')"
+    )
+    conn.commit()
+
+    gov = Governor(str(db))
+    # Governor creates the counter itself on an unmigrated database
+    assert gov._has_generation
+    if not generation:
+        gov._has_generation = False  # read-only database: PRAGMA data_version fallback
+    try:
+        assert gov.check_action(REDIS_ACTION)["decision"] == "ESCALATE"
+
+        conn.execute("UPDATE chunks SET text = 'Never use redis: security risk' WHERE anchor_type = 'D'")
+        conn.commit()
+        result = gov.check_action(REDIS_ACTION)
+        assert result["decision"] == "DENY"
+        assert "redis" in result["reason"]
+
+        # Delete and re-insert: the new row reuses the freed id
+        conn.execute("DELETE FROM chunks WHERE anchor_type = 'D'")
+        conn.commit()
+        assert gov.check_action(REDIS_ACTION)["decision"] == "ESCALATE"
+        conn.execute(
+            "INSERT INTO chunks (anchor_type, anchor_topic, text, timestamp) "
+            "VALUES ('D', 'cache', 'Avoid redis, it is deprecated', '2025-01-02T00:00:00Z')"
+        )
+        conn.commit()
+        assert gov.check_action(REDIS_ACTION)["decision"] == "DENY"
+    finally:
+        gov.close()
+        conn.close()
+
+
+def test_missing_chunks_table_does_not_crash_gate(tmp_path):
+    """A DB with only pending_changes/audit_log (capability_firewall's layout) still gets a verdict"""
+    db = tmp_path / "firewall.db"
+    conn = sqlite3.connect(db)
+    conn.execute(
+        "CREATE TABLE pending_changes (id INTEGER PRIMARY KEY, action_type TEXT, action_data TEXT, "
+        "proposed_by TEXT, proposed_at TEXT, status TEXT, reviewed_by TEXT, reviewed_at TEXT, review_notes TEXT)"
+    )
+    conn.execute(
+        "CREATE TABLE audit_log (id INTEGER PRIMARY KEY, timestamp TEXT, action_type TEXT, "
+        "action_data TEXT, decision TEXT, reason TEXT, actor TEXT)"
+    )
+    conn.commit()
+    conn.close()
+
+    gov = Governor(str(db))
+    try:
+        assert gov.check_action({"action": "exec", "cmd": "redis-cli flushall"})["decision"] == "ESCALATE"
+    finally:
+        gov.close()